@@ -27,6 +27,7 @@ if [[ "${CELERY_COMMAND}" == "beat" ]]; then
 
 elif [[ "${CELERY_COMMAND}" == "worker" ]]; then
     # define queues to serve
+    # (with CELERY_RETRY_QUEUE enabled, some worker needs to serve the "retries" queue as well)
     DEFAULT_QUEUES="short-running,long-running"
     QUEUES="${QUEUES:-$DEFAULT_QUEUES}"
 
@@ -40,6 +41,16 @@ elif [[ "${CELERY_COMMAND}" == "worker" ]]; then
     DEFAULT_POOL="prefork"
     POOL="${POOL:-$DEFAULT_POOL}"
 
+    # autoscaling works only with the prefork pool,
+    # the green threads of eventlet/gevent suit the network-bound handlers
+    # and can run many of them in one process
+    if [[ "${POOL}" == "gevent" || "${POOL}" == "eventlet" ]]; then
+      DEFAULT_CONCURRENCY="50"
+      CONCURRENCY_OPTION="--concurrency=${CONCURRENCY:-$DEFAULT_CONCURRENCY}"
+    else
+      CONCURRENCY_OPTION="--autoscale=${AUTOSCALE}"
+    fi
+
     # if this worker serves the long-running queue, it needs the repository cache
     if [[ "$QUEUES" == *"long-running"* ]]; then
       # Can't be set during deployment
@@ -48,5 +59,5 @@ elif [[ "${CELERY_COMMAND}" == "worker" ]]; then
     fi
 
     # https://docs.celeryq.dev/en/stable/userguide/optimizing.html#optimizing-prefetch-limit
-    exec celery --app="${APP}" worker --loglevel="${LOGLEVEL:-DEBUG}" --autoscale="${AUTOSCALE}" --pool="${POOL}" --prefetch-multiplier=1 --queues="${QUEUES}"
+    exec celery --app="${APP}" worker --loglevel="${LOGLEVEL:-DEBUG}" "${CONCURRENCY_OPTION}" --pool="${POOL}" --prefetch-multiplier=1 --queues="${QUEUES}"
 fi
@@ -4,11 +4,69 @@
 from os import getenv
 
 from celery import Celery
+from kombu import serialization
+from kombu.utils import json as kombu_json
 from lazy_object_proxy import Proxy
 
+from packit_service.constants import CELERY_ORJSON_SERIALIZER
 from packit_service.sentry_integration import configure_sentry
 
 
+def _revive_kombu_types(obj):
+    # the same as the object_hook used by kombu when loading json
+    if isinstance(obj, dict):
+        return kombu_json.object_hook(
+            {key: _revive_kombu_types(value) for key, value in obj.items()}
+        )
+    if isinstance(obj, list):
+        return [_revive_kombu_types(item) for item in obj]
+    return obj
+
+
+def register_orjson_serializer():
+    """
+    Register an orjson based serializer for the Celery messages,
+    it's used only when enabled via CELERY_TASK_SERIALIZER=orjson.
+
+    Both encoding and decoding happens in C which makes a difference
+    for the big package_config/job_config/event payloads of our tasks.
+
+    To stay compatible with the default `json` serializer of kombu, the types
+    kombu wraps as `{"__type__": ..., "__value__": ...}` (datetime, date, time,
+    Decimal and bytes) are wrapped the same way by the `default` hook of orjson
+    and unwrapped when loading. The only exception are UUIDs which orjson
+    serializes natively, they are loaded back as plain strings.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return
+
+    encoder = kombu_json.JSONEncoder()
+    options = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=encoder.default, option=options)
+
+    def loads(data):
+        obj = orjson.loads(data)
+        # walk the loaded objects only if there is something to unwrap
+        marker = '"__type__"' if isinstance(data, str) else b'"__type__"'
+        return _revive_kombu_types(obj) if marker in data else obj
+
+    serialization.register(
+        CELERY_ORJSON_SERIALIZER,
+        dumps,
+        loads,
+        content_type="application/x-orjson",
+        content_encoding="utf-8",
+    )
+
+
 class Celerizer:
     def __init__(self):
         self._celery_app = None
@@ -16,6 +74,8 @@ class Celerizer:
     @property
     def celery_app(self):
         if self._celery_app is None:
+            register_orjson_serializer()
+
             host = getenv("REDIS_SERVICE_HOST", "redis")
             password = getenv("REDIS_PASSWORD", "")
             port = getenv("REDIS_SERVICE_PORT", "6379")
@@ -1,5 +1,8 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
+from importlib.util import find_spec
+from os import getenv
+
 from celery.schedules import crontab
 
 import packit_service.constants
@@ -7,6 +10,15 @@ import packit_service.constants
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_default_queue
 task_default_queue = packit_service.constants.CELERY_TASK_DEFAULT_QUEUE
 
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_serializer
+# use CELERY_TASK_SERIALIZER=orjson to opt in to the faster orjson serializer
+task_serializer = getenv("CELERY_TASK_SERIALIZER", "json")
+# accept both (if orjson is installed) so that the messages sent
+# before/after switching the serializer are processed
+accept_content = ["json"]
+if find_spec("orjson"):
+    accept_content.append(packit_service.constants.CELERY_ORJSON_SERIALIZER)
+
 # https://docs.celeryq.dev/en/stable/userguide/periodic-tasks.html
 beat_schedule = {
     "update-pending-copr-builds": {
@@ -21,6 +21,7 @@ from packit.exceptions import (
     PackitException,
     PackitMissingConfigException,
 )
+from packit.utils.repo import RepositoryCache
 from packit_service.constants import (
     CONFIG_FILE_NAME,
     CONTACTS_URL,
@@ -174,6 +175,24 @@ class ServiceConfig(Config):
 
     service_config = None
 
+    def get_repository_cache(self) -> Optional[RepositoryCache]:
+        """
+        Get the repository cache to use for a local project.
+
+        A new instance is created for each call, RepositoryCache records
+        every cloned project, so a shared one would grow with each task.
+
+        Returns:
+            RepositoryCache or None if the repository cache is not configured.
+        """
+        if not self.repository_cache:
+            return None
+
+        return RepositoryCache(
+            cache_path=self.repository_cache,
+            add_new=self.add_repositories_to_repository_cache,
+        )
+
     def __repr__(self):
         def hide(token: str) -> str:
             return f"{token[:1]}***{token[-1:]}" if token else ""
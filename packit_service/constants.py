@@ -101,6 +101,12 @@ CELERY_TASK_DEFAULT_QUEUE = "short-running"
 
 CELERY_DEFAULT_MAIN_TASK_NAME = "task.steve_jobs.process_message"
 
+CELERY_ORJSON_SERIALIZER = "orjson"
+
+# queue for the retried tasks so that they don't occupy the primary workers,
+# used only when enabled via CELERY_RETRY_QUEUE (a worker needs to consume it)
+CELERY_TASK_RETRY_QUEUE = "retries"
+
 MSG_MORE_DETAILS = "You can find more details about the job [here]({url}).\n\n"
 
 MSG_TABLE_HEADER_WITH_DETAILS = "| Name/Job | URL |\n" "| --- | --- |\n"
@@ -43,6 +43,7 @@ from sqlalchemy.dialects.postgresql import array as psql_array
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import (
     Session as SQLASession,
+    joinedload,
     relationship,
     scoped_session,
     sessionmaker,
@@ -817,6 +818,14 @@ class CoprBuildTargetModel(ProjectAndTriggersConnector, Base):
             self.status = status
             session.add(self)
 
+    @classmethod
+    def bulk_set_status(cls, ids: Iterable[int], status: str) -> None:
+        """Sets the status of all the builds with the given IDs in one query."""
+        with sa_session_transaction() as session:
+            session.query(CoprBuildTargetModel).filter(
+                CoprBuildTargetModel.id.in_(ids)
+            ).update({CoprBuildTargetModel.status: status}, synchronize_session="fetch")
+
     def set_build_logs_url(self, build_logs: str):
         with sa_session_transaction() as session:
             self.build_logs_url = build_logs
@@ -881,9 +890,19 @@ class CoprBuildTargetModel(ProjectAndTriggersConnector, Base):
         return sa_session().query(CoprBuildTargetModel).filter_by(build_id=build_id)
 
     @classmethod
-    def get_all_by_status(cls, status: str) -> Iterable["CoprBuildTargetModel"]:
-        """Returns all builds which currently have the given status."""
-        return sa_session().query(CoprBuildTargetModel).filter_by(status=status)
+    def get_all_by_status(
+        cls, status: str, submitted_before: Optional[datetime] = None
+    ) -> Iterable["CoprBuildTargetModel"]:
+        """Returns all builds which currently have the given status.
+
+        If submitted_before is set, only the builds submitted before that time
+        are returned."""
+        query = sa_session().query(CoprBuildTargetModel).filter_by(status=status)
+        if submitted_before:
+            query = query.filter(
+                CoprBuildTargetModel.build_submitted_time < submitted_before
+            )
+        return query
 
     # returns the build matching the build_id and the target
     @classmethod
@@ -1487,15 +1506,42 @@ class TFTTestRunTargetModel(ProjectAndTriggersConnector, Base):
 
     @classmethod
     def get_all_by_status(
-        cls, *status: TestingFarmResult
+        cls, *status: TestingFarmResult, eager: bool = False
     ) -> Iterable["TFTTestRunTargetModel"]:
         """Returns all runs which currently have their status set to one
-        of the requested statuses."""
-        return (
-            sa_session()
-            .query(TFTTestRunTargetModel)
-            .filter(TFTTestRunTargetModel.status.in_(status))
-        )
+        of the requested statuses.
+
+        If eager is set, the pipelines and job triggers of the runs are loaded
+        in the same query instead of lazily for each run."""
+        query = sa_session().query(TFTTestRunTargetModel)
+        if eager:
+            query = query.options(
+                joinedload(TFTTestRunTargetModel.runs).joinedload(
+                    PipelineModel.job_trigger
+                )
+            )
+        return query.filter(TFTTestRunTargetModel.status.in_(status))
+
+    @classmethod
+    def expire_stale(cls, cutoff: datetime, *status: TestingFarmResult) -> int:
+        """Sets all runs which have their status set to one of the requested
+        statuses and were submitted before the cutoff to error, in one query.
+
+        Returns:
+            Number of the expired runs.
+        """
+        with sa_session_transaction() as session:
+            return (
+                session.query(TFTTestRunTargetModel)
+                .filter(
+                    TFTTestRunTargetModel.status.in_(status),
+                    TFTTestRunTargetModel.submitted_time < cutoff,
+                )
+                .update(
+                    {TFTTestRunTargetModel.status: TestingFarmResult.error},
+                    synchronize_session="fetch",
+                )
+            )
 
     @classmethod
     def get_by_id(cls, id: int) -> Optional["TFTTestRunTargetModel"]:
@@ -1566,6 +1612,23 @@ class ProposeDownstreamTargetModel(ProjectAndTriggersConnector, Base):
             session.add(propose_downstream_target)
             return propose_downstream_target
 
+    @classmethod
+    def create_for_branches(
+        cls, status: ProposeDownstreamTargetStatus, branches: Iterable[str]
+    ) -> List["ProposeDownstreamTargetModel"]:
+        """
+        Create the targets for all the branches in a single transaction.
+        """
+        with sa_session_transaction() as session:
+            propose_downstream_targets = []
+            for branch in branches:
+                propose_downstream_target = cls()
+                propose_downstream_target.status = status
+                propose_downstream_target.branch = branch
+                propose_downstream_targets.append(propose_downstream_target)
+            session.add_all(propose_downstream_targets)
+            return propose_downstream_targets
+
     def set_status(self, status: ProposeDownstreamTargetStatus) -> None:
         with sa_session_transaction() as session:
             self.status = status
@@ -82,6 +82,9 @@ def push_scope_to_sentry():
             def set_tag(self, k, v):
                 pass
 
+            def set_tags(self, tags):
+                pass
+
         yield SentryMocker()
     else:
 
@@ -2,9 +2,10 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+import weakref
 from io import StringIO
 from logging import StreamHandler
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 from packit.config import JobConfig, PackageConfig
@@ -55,6 +56,83 @@ def dump_job_config(job_config: JobConfig):
     return JobConfigSchema().dump(job_config) if job_config else None
 
 
+class WeakIdentityCache:
+    """
+    Values computed for objects, kept until the object is garbage collected.
+
+    Similar to `weakref.WeakKeyDictionary`, but the objects are looked up
+    by their identity, so they don't need to be hashable
+    (the packit configs define `__eq__` without `__hash__`).
+    """
+
+    __slots__ = ("_values", "_finalizers")
+
+    def __init__(self):
+        self._values: Dict[int, Any] = {}
+        self._finalizers: Dict[int, weakref.finalize] = {}
+
+    def __contains__(self, obj) -> bool:
+        return id(obj) in self._values
+
+    def __getitem__(self, obj):
+        return self._values[id(obj)]
+
+    def __setitem__(self, obj, value):
+        key = id(obj)
+        if key not in self._values:
+            self._finalizers[key] = weakref.finalize(obj, self._drop, key)
+        self._values[key] = value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def pop(self, obj, default=None):
+        key = id(obj)
+        finalizer = self._finalizers.pop(key, None)
+        if finalizer is not None:
+            finalizer.detach()
+        return self._values.pop(key, default)
+
+    def _drop(self, key: int):
+        self._finalizers.pop(key, None)
+        self._values.pop(key, None)
+
+
+# config -> dumped config
+_DUMPED_PACKAGE_CONFIGS = WeakIdentityCache()
+_DUMPED_JOB_CONFIGS = WeakIdentityCache()
+
+
+def _dump_cached(config, cache: WeakIdentityCache, dump: Callable) -> Optional[dict]:
+    if not config:
+        return None
+
+    if config not in cache:
+        cache[config] = dump(config)
+    return cache[config]
+
+
+def dump_package_config_cached(package_config: PackageConfig) -> Optional[dict]:
+    """
+    Same as `dump_package_config`, but the result is memoized for the lifetime
+    of the given package config object.
+
+    One event usually matches multiple handlers so we would otherwise
+    serialize the same package config for each of them.
+    Don't modify the returned dictionary.
+    """
+    return _dump_cached(package_config, _DUMPED_PACKAGE_CONFIGS, dump_package_config)
+
+
+def dump_job_config_cached(job_config: JobConfig) -> Optional[dict]:
+    """
+    Same as `dump_job_config`, but the result is memoized for the lifetime
+    of the given job config object.
+    Don't modify the returned dictionary.
+    """
+    return _dump_cached(job_config, _DUMPED_JOB_CONFIGS, dump_job_config)
+
+
 def get_package_nvrs(built_packages: List[dict]) -> List[str]:
     """
     Construct package NVRs for built packages except the SRPM.
@@ -119,5 +197,5 @@ def collect_packit_logs(buffer: StringIO, handler: StreamHandler) -> str:
     """
     packit_logger = logging.getLogger("packit")
     packit_logger.removeHandler(handler)
-    buffer.seek(0)
-    return buffer.read()
+    handler.close()
+    return buffer.getvalue()
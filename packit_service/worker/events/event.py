@@ -22,12 +22,17 @@ from packit_service.models import (
     PullRequestModel,
     TFTTestRunTargetModel,
 )
+from packit_service.utils import WeakIdentityCache
 
 logger = getLogger(__name__)
 
 
 MAP_EVENT_TO_JOB_CONFIG_TRIGGER_TYPE: Dict[Type["Event"], JobConfigTriggerType] = {}
 
+# event -> result of its get_dict(), see Event.get_dict_cached
+_EVENT_DICTS = WeakIdentityCache()
+_COMPUTING_EVENT_DICT = object()
+
 
 def use_for_job_config_trigger(trigger_type: JobConfigTriggerType):
     """
@@ -291,6 +296,34 @@ class Event:
             d["branches_override"] = list(self.branches_override)
         return d
 
+    def __setattr__(self, name, value):
+        # the dictionary representation of the event might not be valid anymore
+        _EVENT_DICTS.pop(self, None)
+        super().__setattr__(name, value)
+
+    def get_dict_cached(self) -> dict:
+        """
+        Same as get_dict(), but the result is reused until an attribute of the event changes.
+
+        One event is passed to multiple handlers and tasks,
+        but we don't need to deep-copy the event for each of them.
+        Don't modify the returned dictionary.
+        """
+        if self in _EVENT_DICTS:
+            return _EVENT_DICTS[self]
+
+        # get_dict() can itself set some lazy attributes, in that case
+        # the placeholder is dropped and we don't cache the (outdated) result
+        _EVENT_DICTS[self] = _COMPUTING_EVENT_DICT
+        try:
+            event_dict = self.get_dict()
+        finally:
+            computed = _EVENT_DICTS.pop(self, None) is _COMPUTING_EVENT_DICT
+
+        if computed:
+            _EVENT_DICTS[self] = event_dict
+        return event_dict
+
     def get_db_trigger(self) -> Optional[AbstractTriggerDbType]:
         return None
 
@@ -300,6 +333,11 @@ class Event:
             self._db_trigger = self.get_db_trigger()
         return self._db_trigger
 
+    @db_trigger.setter
+    def db_trigger(self, db_trigger: Optional[AbstractTriggerDbType]):
+        """Use an already obtained trigger instead of looking it up in DB."""
+        self._db_trigger = db_trigger
+
     @property
     def job_config_trigger_type(self) -> Optional[JobConfigTriggerType]:
         """
@@ -422,6 +460,12 @@ class AbstractForgeIndependentEvent(Event):
             self._package_config_searched = True
         return self._package_config
 
+    @package_config.setter
+    def package_config(self, package_config: Optional[PackageConfig]):
+        """Use an already obtained package config instead of searching for it."""
+        self._package_config = package_config
+        self._package_config_searched = True
+
     def get_db_trigger(self) -> Optional[AbstractTriggerDbType]:
         raise NotImplementedError()
 
@@ -6,44 +6,69 @@ This file defines generic job handler
 """
 import enum
 import logging
+import re
 import shutil
 from celery import Task
-from collections import defaultdict
 from datetime import datetime
-from os import getenv
+from functools import lru_cache
+from os import getenv, scandir, unlink
 from pathlib import Path
-from typing import Dict, Optional, Set, Type, List
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Optional,
+    Set,
+    TYPE_CHECKING,
+    Tuple,
+    Type,
+    List,
+)
 
 from celery import signature
 from celery.canvas import Signature
 from ogr.abstract import GitProject
-from packit.api import PackitAPI
 from packit.config import JobConfig, JobType, PackageConfig
-from packit.constants import DATETIME_FORMAT
-from packit.local_project import LocalProject
 
 from packit_service.config import ServiceConfig
-from packit_service.constants import DEFAULT_RETRY_LIMIT
+from packit_service.constants import CELERY_TASK_RETRY_QUEUE, DEFAULT_RETRY_LIMIT
 from packit_service.models import (
     AbstractTriggerDbType,
 )
 from packit_service.sentry_integration import push_scope_to_sentry
 from packit_service.worker.events import Event, EventData
-from packit_service.worker.monitoring import Pushgateway
-from packit_service.utils import dump_job_config, dump_package_config
+from packit_service.worker.monitoring import get_pushgateway
+from packit_service.utils import dump_job_config_cached, dump_package_config_cached
 from packit_service.worker.result import TaskResults
 
+if TYPE_CHECKING:
+    # used only for type hints, don't load the whole API when importing the handlers
+    from packit.api import PackitAPI
+    from packit.local_project import LocalProject
+
 logger = logging.getLogger(__name__)
 
-MAP_JOB_TYPE_TO_HANDLER: Dict[JobType, Set[Type["JobHandler"]]] = defaultdict(set)
-MAP_REQUIRED_JOB_TYPE_TO_HANDLER: Dict[JobType, Set[Type["JobHandler"]]] = defaultdict(
-    set
-)
-SUPPORTED_EVENTS_FOR_HANDLER: Dict[
-    Type["JobHandler"], Set[Type["Event"]]
-] = defaultdict(set)
-MAP_COMMENT_TO_HANDLER: Dict[str, Set[Type["JobHandler"]]] = defaultdict(set)
-MAP_CHECK_PREFIX_TO_HANDLER: Dict[str, Set[Type["JobHandler"]]] = defaultdict(set)
+# marks the project of a handler that has not been looked up yet
+# (so that we can cache also the handlers without any project)
+_PROJECT_NOT_RESOLVED: Any = object()
+
+# the environment of the worker doesn't change, no need to check it for every handler
+_IN_KUBERNETES = bool(getenv("KUBERNETES_SERVICE_HOST"))
+
+# Mappings filled by the decorators below.
+# (Plain dicts so that a lookup for a missing key doesn't insert an empty set,
+# use .get() for reading.)
+MAP_JOB_TYPE_TO_HANDLER: Dict[JobType, Set[Type["JobHandler"]]] = {}
+MAP_REQUIRED_JOB_TYPE_TO_HANDLER: Dict[JobType, Set[Type["JobHandler"]]] = {}
+SUPPORTED_EVENTS_FOR_HANDLER: Dict[Type["JobHandler"], Set[Type["Event"]]] = {}
+MAP_COMMENT_TO_HANDLER: Dict[str, Set[Type["JobHandler"]]] = {}
+MAP_CHECK_PREFIX_TO_HANDLER: Dict[str, Set[Type["JobHandler"]]] = {}
+
+# (event type, job type) -> handlers configured for the job type and reacting to the event,
+# computed from the mappings above on first use
+_HANDLERS_FOR_EVENT_AND_JOB_TYPE: Dict[
+    Tuple[Type["Event"], JobType], FrozenSet[Type["JobHandler"]]
+] = {}
 
 
 def configured_as(job_type: JobType):
@@ -73,7 +98,8 @@ def configured_as(job_type: JobType):
     """
 
     def _add_to_mapping(kls: Type["JobHandler"]):
-        MAP_JOB_TYPE_TO_HANDLER[job_type].add(kls)
+        MAP_JOB_TYPE_TO_HANDLER.setdefault(job_type, set()).add(kls)
+        _HANDLERS_FOR_EVENT_AND_JOB_TYPE.clear()
         return kls
 
     return _add_to_mapping
@@ -104,7 +130,8 @@ def required_for(job_type: JobType):
     """
 
     def _add_to_mapping(kls: Type["JobHandler"]):
-        MAP_REQUIRED_JOB_TYPE_TO_HANDLER[job_type].add(kls)
+        MAP_REQUIRED_JOB_TYPE_TO_HANDLER.setdefault(job_type, set()).add(kls)
+        _HANDLERS_FOR_EVENT_AND_JOB_TYPE.clear()
         return kls
 
     return _add_to_mapping
@@ -128,7 +155,8 @@ def reacts_to(event: Type["Event"]):
     """
 
     def _add_to_mapping(kls: Type["JobHandler"]):
-        SUPPORTED_EVENTS_FOR_HANDLER[kls].add(event)
+        SUPPORTED_EVENTS_FOR_HANDLER.setdefault(kls, set()).add(event)
+        _HANDLERS_FOR_EVENT_AND_JOB_TYPE.clear()
         return kls
 
     return _add_to_mapping
@@ -157,7 +185,7 @@ def run_for_comment(command: str):
     """
 
     def _add_to_mapping(kls: Type["JobHandler"]):
-        MAP_COMMENT_TO_HANDLER[command].add(kls)
+        MAP_COMMENT_TO_HANDLER.setdefault(command, set()).add(kls)
         return kls
 
     return _add_to_mapping
@@ -185,30 +213,83 @@ def run_for_check_rerun(prefix: str):
     """
 
     def _add_to_mapping(kls: Type["JobHandler"]):
-        MAP_CHECK_PREFIX_TO_HANDLER[prefix].add(kls)
+        MAP_CHECK_PREFIX_TO_HANDLER.setdefault(prefix, set()).add(kls)
         return kls
 
     return _add_to_mapping
 
 
+def get_handlers_for_event_and_job_type(
+    event_type: Type["Event"], job_type: JobType
+) -> FrozenSet[Type["JobHandler"]]:
+    """
+    Get handlers that are configured as (or required for) the given job type
+    and react to the given event type (respecting the event class hierarchy).
+
+    The result is computed only once for each combination.
+
+    Args:
+        event_type: class of the event we are reacting to
+        job_type: type of the job from the package config
+
+    Returns:
+        Frozen set of handler classes.
+    """
+    key = (event_type, job_type)
+    handlers = _HANDLERS_FOR_EVENT_AND_JOB_TYPE.get(key)
+    if handlers is None:
+        handlers = _HANDLERS_FOR_EVENT_AND_JOB_TYPE[key] = frozenset(
+            handler
+            for handler in MAP_JOB_TYPE_TO_HANDLER.get(job_type, set())
+            | MAP_REQUIRED_JOB_TYPE_TO_HANDLER.get(job_type, set())
+            if issubclass(
+                event_type, tuple(SUPPORTED_EVENTS_FOR_HANDLER.get(handler, ()))
+            )
+        )
+    return handlers
+
+
+@lru_cache(maxsize=None)
+def _get_packit_command_regex(packit_comment_command_prefix: str) -> re.Pattern:
+    """
+    Regex matching the first line with the packit command,
+    groups contain the first word, the second one and the rest of the line.
+    (Whitespace other than a newline is not allowed to span the lines.)
+    """
+    return re.compile(
+        rf"^[^\S\n]*{re.escape(packit_comment_command_prefix)}"
+        r"[^\S\n]+(\S+)(?:[^\S\n]+(\S+))?(?:[^\S\n]+(.*?))?[^\S\n]*$",
+        re.MULTILINE,
+    )
+
+
 def get_packit_commands_from_comment(
     comment: str, packit_comment_command_prefix: str
 ) -> List[str]:
-    comment_parts = comment.strip()
+    # most of the comments don't contain any command, a substring search is cheaper
+    if packit_comment_command_prefix not in comment:
+        return []
 
-    if not comment_parts:
-        logger.debug("Empty comment, nothing to do.")
+    match = _get_packit_command_regex(packit_comment_command_prefix).search(comment)
+    if not match:
         return []
 
-    comment_lines = comment_parts.split("\n")
+    # [0] has the first cmd and [1] has the second, if needed.
+    return [part for part in match.groups() if part]
 
-    for line in filter(None, map(str.strip, comment_lines)):
-        (packit_mark, *packit_command) = line.split(maxsplit=3)
-        # packit_command[0] has the first cmd and [1] has the second, if needed.
-        if packit_mark == packit_comment_command_prefix and packit_command:
-            return packit_command
 
-    return []
+@lru_cache(maxsize=1)
+def _get_retry_limit() -> int:
+    # the environment of the worker doesn't change, parse the value only once
+    return int(getenv("CELERY_RETRY_LIMIT", DEFAULT_RETRY_LIMIT))
+
+
+@lru_cache(maxsize=1)
+def _get_retry_queue() -> Optional[str]:
+    # queue for the retried tasks or None if they should stay in the original queue
+    if getenv("CELERY_RETRY_QUEUE", "").lower() in ("1", "true", "yes"):
+        return CELERY_TASK_RETRY_QUEUE
+    return None
 
 
 class CeleryTask:
@@ -216,6 +297,8 @@ class CeleryTask:
     Class wrapping the Celery task object with methods related to retrying.
     """
 
+    __slots__ = ("task",)
+
     def __init__(self, task: Task):
         self.task = task
 
@@ -237,7 +320,7 @@ class CeleryTask:
         (Packit uses this env.var. in HandlerTaskWithRetry base class
         to set `max_retries` in `retry_kwargs`.)
         """
-        return int(getenv("CELERY_RETRY_LIMIT", DEFAULT_RETRY_LIMIT))
+        return _get_retry_limit()
 
     def retry(
         self,
@@ -261,15 +344,20 @@ class CeleryTask:
         """
         retries = self.retries
         delay = delay if delay is not None else 60 * 2**retries
-        logger.info(f"Will retry for the {retries + 1}. time in {delay}s.")
-        kargs = self.task.request.kwargs.copy()
+        logger.info("Will retry for the %s. time in %ss.", retries + 1, delay)
+        # without an explicit queue, Celery sends the retry to the queue
+        # the task was received from
+        retry_queue = _get_retry_queue()
+        options = {"queue": retry_queue} if retry_queue else {}
+        # no need to copy the kwargs, Celery only puts them into the new message
         self.task.retry(
             exc=ex,
             countdown=delay,
             throw=False,
             args=(),
-            kwargs=kargs,
+            kwargs=self.task.request.kwargs,
             max_retries=max_retries,
+            **options,
         )
 
 
@@ -293,15 +381,17 @@ class TaskName(str, enum.Enum):
 
 
 class Handler:
-    api: Optional[PackitAPI] = None
-    local_project: Optional[LocalProject] = None
+    api: Optional["PackitAPI"] = None
+    local_project: Optional["LocalProject"] = None
     _service_config: Optional[ServiceConfig] = None
 
     @property
     def service_config(self) -> ServiceConfig:
-        if not self._service_config:
-            self._service_config = ServiceConfig.get_service_config()
-        return self._service_config
+        # the service config is the same for the whole process,
+        # cache it on the class so that every new handler can reuse it
+        if not Handler._service_config:
+            Handler._service_config = ServiceConfig.get_service_config()
+        return Handler._service_config
 
     @property
     def project(self) -> Optional[GitProject]:
@@ -313,11 +403,12 @@ class Handler:
     def get_tag_info(self) -> dict:
         tags = {"handler": self.__class__.__name__}
         # repository info for easier filtering events that were grouped based on event type
-        if self.project:
+        project = self.project
+        if project:
             tags.update(
                 {
-                    "repository": self.project.repo,
-                    "namespace": self.project.namespace,
+                    "repository": project.repo,
+                    "namespace": project.namespace,
                 }
             )
         return tags
@@ -325,15 +416,14 @@ class Handler:
     def run_n_clean(self) -> TaskResults:
         try:
             with push_scope_to_sentry() as scope:
-                for k, v in self.get_tag_info().items():
-                    scope.set_tag(k, v)
+                scope.set_tags(self.get_tag_info())
                 return self.run()
         finally:
             self.clean()
 
     def _clean_workplace(self):
         # clean only when we are in k8s for sure
-        if not getenv("KUBERNETES_SERVICE_HOST"):
+        if not _IN_KUBERNETES:
             logger.debug("This is not a kubernetes pod, won't clean.")
             return
         logger.debug("Removing contents of the PV.")
@@ -341,21 +431,21 @@ class Handler:
         # Do not clean dir if does not exist
         if not p.is_dir():
             logger.debug(
-                f"Directory {self.service_config.command_handler_work_dir!r} does not exist."
+                "Directory %r does not exist.",
+                self.service_config.command_handler_work_dir,
             )
             return
 
         # remove everything in the volume, but not the volume dir
-        dir_items = list(p.iterdir())
-        if dir_items:
-            logger.info("Volume is not empty.")
-            logger.debug(f"Content: {[g.name for g in dir_items]}")
-        for item in dir_items:
-            # symlink pointing to a dir is also a dir and a symlink
-            if item.is_symlink() or item.is_file():
-                item.unlink()
-            else:
-                shutil.rmtree(item)
+        # (DirEntry caches the stat result so we don't need to call it for each check)
+        with scandir(p) as dir_items:
+            for item in dir_items:
+                logger.debug("Removing %r from the volume.", item.name)
+                # symlink pointing to a dir is not considered a dir here
+                if item.is_dir(follow_symlinks=False):
+                    shutil.rmtree(item.path)
+                else:
+                    unlink(item.path)
 
     def pre_check(self) -> bool:
         """
@@ -378,6 +468,8 @@ class JobHandler(Handler):
     """Generic interface to handle different type of inputs"""
 
     task_name: TaskName
+    # plain string value of the task_name, resolved once for each subclass
+    _task_name_value: str
 
     def __init__(
         self,
@@ -390,18 +482,28 @@ class JobHandler(Handler):
         # always use job_config to pick up values, use package_config only for package_config.jobs
         self.job_config = job_config
         self.data = EventData.from_event_dict(event)
-        self.pushgateway = Pushgateway()
+        self.pushgateway = get_pushgateway()
 
         self._db_trigger: Optional[AbstractTriggerDbType] = None
-        self._project: Optional[GitProject] = None
-        self._clean_workplace()
+        self._project: Optional[GitProject] = _PROJECT_NOT_RESOLVED
+        if _IN_KUBERNETES:
+            self._clean_workplace()
 
     @property
     def project(self) -> Optional[GitProject]:
-        if not self._project and self.data.project_url:
-            self._project = self.service_config.get_project(url=self.data.project_url)
+        if self._project is _PROJECT_NOT_RESOLVED:
+            self._project = (
+                self.service_config.get_project(url=self.data.project_url)
+                if self.data.project_url
+                else None
+            )
         return self._project
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "task_name" in cls.__dict__:
+            cls._task_name_value = cls.task_name.value
+
     @classmethod
     def get_all_subclasses(cls) -> Set[Type["JobHandler"]]:
         return set(cls.__subclasses__()).union(
@@ -422,13 +524,15 @@ class JobHandler(Handler):
         If pre-check succeeds, run the job for the specific handler.
         :return: Dict [str, TaskResults]
         """
+        # the enum values are string literals and therefore already interned
         job_type = (
-            self.job_config.type.value if self.job_config else self.task_name.value
+            self.job_config.type.value if self.job_config else self._task_name_value
         )
-        logger.debug(f"Running handler {str(self)} for {job_type}")
+        logger.debug("Running handler %s for %s", self, job_type)
         job_results: Dict[str, TaskResults] = {}
-        current_time = datetime.now().strftime(DATETIME_FORMAT)
-        result_key = f"{job_type}-{current_time}"
+        # isoformat is considerably faster than strftime
+        current_time = datetime.now().isoformat(timespec="microseconds")
+        result_key = job_type + "-" + current_time
         job_results[result_key] = self.run_n_clean()
         logger.debug("Job finished!")
 
@@ -449,13 +553,13 @@ class JobHandler(Handler):
         :param event: event which triggered the task
         :param job: job to process
         """
-        logger.debug(f"Getting signature of a Celery task {cls.task_name}.")
+        logger.debug("Getting signature of a Celery task %s.", cls._task_name_value)
         return signature(
-            cls.task_name.value,
+            cls._task_name_value,
             kwargs={
-                "package_config": dump_package_config(event.package_config),
-                "job_config": dump_job_config(job),
-                "event": event.get_dict(),
+                "package_config": dump_package_config_cached(event.package_config),
+                "job_config": dump_job_config_cached(job),
+                "event": event.get_dict_cached(),
             },
         )
 
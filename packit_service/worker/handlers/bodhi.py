@@ -19,7 +19,6 @@ from packit.config.aliases import get_branches
 
 from packit.config import JobConfig, JobType, PackageConfig
 from packit.local_project import LocalProject
-from packit.utils.repo import RepositoryCache
 from packit_service.config import PackageConfigGetter
 from packit_service.constants import (
     CONTACTS_URL,
@@ -105,12 +104,7 @@ class CreateBodhiUpdateHandler(RetriableJobHandler):
         self.local_project = LocalProject(
             git_project=self.project,
             working_dir=self.service_config.command_handler_work_dir,
-            cache=RepositoryCache(
-                cache_path=self.service_config.repository_cache,
-                add_new=self.service_config.add_repositories_to_repository_cache,
-            )
-            if self.service_config.repository_cache
-            else None,
+            cache=self.service_config.get_repository_cache(),
         )
         packit_api = PackitAPI(
             self.service_config,
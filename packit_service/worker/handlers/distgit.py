@@ -8,7 +8,10 @@ import logging
 import shutil
 from celery import Task
 from datetime import datetime
-from typing import Optional, Dict
+from functools import lru_cache
+from threading import Lock, Thread
+from time import monotonic
+from typing import Optional, Dict, FrozenSet, Tuple
 
 from fasjson_client import Client
 from fasjson_client.errors import APIError
@@ -20,7 +23,6 @@ from packit.config.aliases import get_branches
 from packit.config.package_config import PackageConfig
 from packit.exceptions import PackitException, PackitDownloadFailedException
 from packit.local_project import LocalProject
-from packit.utils.repo import RepositoryCache
 from packit_service import sentry_integration
 from packit_service.config import PackageConfigGetter, ProjectToSync
 from packit_service.constants import (
@@ -94,19 +96,15 @@ class SyncFromDownstream(JobHandler):
         return self.project_to_sync is not None
 
     def run(self) -> TaskResults:
+        project_to_sync = self.project_to_sync
         ogr_project_to_sync = self.service_config.get_project(
-            url=f"{self.project_to_sync.forge}/"
-            f"{self.project_to_sync.repo_namespace}/{self.project_to_sync.repo_name}"
+            url=f"{project_to_sync.forge}/"
+            f"{project_to_sync.repo_namespace}/{project_to_sync.repo_name}"
         )
         upstream_local_project = LocalProject(
             git_project=ogr_project_to_sync,
             working_dir=self.service_config.command_handler_work_dir,
-            cache=RepositoryCache(
-                cache_path=self.service_config.repository_cache,
-                add_new=self.service_config.add_repositories_to_repository_cache,
-            )
-            if self.service_config.repository_cache
-            else None,
+            cache=self.service_config.get_repository_cache(),
         )
         packit_api = PackitAPI(
             self.service_config,
@@ -118,12 +116,49 @@ class SyncFromDownstream(JobHandler):
         # TODO: check if rev is HEAD on {branch}, warn then?
         packit_api.sync_from_downstream(
             dist_git_branch=self.dg_branch,
-            upstream_branch=self.project_to_sync.branch,
+            upstream_branch=project_to_sync.branch,
             sync_only_specfile=True,
         )
         return TaskResults(success=True, details={})
 
 
+# targets in other states were already processed (even if they failed)
+PROPOSE_DOWNSTREAM_TARGET_STATUSES_TO_RUN = frozenset(
+    (
+        ProposeDownstreamTargetStatus.running,
+        ProposeDownstreamTargetStatus.retry,
+        ProposeDownstreamTargetStatus.queued,
+    )
+)
+
+
+@lru_cache(maxsize=None)
+def _get_propose_downstream_msg_retrigger(packit_comment_command_prefix: str) -> str:
+    return MSG_RETRIGGER.format(
+        job="update",
+        command="propose-downstream",
+        place="issue",
+        packit_comment_command_prefix=packit_comment_command_prefix,
+    )
+
+
+def remove_dir_in_background(path: str) -> Thread:
+    """
+    Remove the directory tree in a separate thread so that the caller is not blocked.
+    The thread is not a daemon one so that the process waits for it before exiting.
+    """
+
+    def remove():
+        try:
+            shutil.rmtree(path)
+        except OSError as ex:
+            logger.warning("Failed to remove %r: %r", path, ex)
+
+    thread = Thread(target=remove, name=f"rmtree {path}")
+    thread.start()
+    return thread
+
+
 class AbortProposeDownstream(Exception):
     """Abort propose-downstream process"""
 
@@ -209,18 +244,15 @@ class ProposeDownstreamHandler(RetriableJobHandler):
         return downstream_pr
 
     def _report_errors_for_each_branch(self, errors: Dict[str, str]) -> None:
-        branch_errors = ""
-        for branch, err in sorted(
-            errors.items(), key=lambda branch_error: branch_error[0]
-        ):
-            err_without_new_lines = err.replace("\n", " ")
-            branch_errors += f"| `{branch}` | `{err_without_new_lines}` |\n"
-
-        msg_retrigger = MSG_RETRIGGER.format(
-            job="update",
-            command="propose-downstream",
-            place="issue",
-            packit_comment_command_prefix=self.service_config.comment_command_prefix,
+        errors_without_new_lines = (
+            (branch, err.replace("\n", " ")) for branch, err in sorted(errors.items())
+        )
+        branch_errors = "".join(
+            f"| `{branch}` | `{err}` |\n" for branch, err in errors_without_new_lines
+        )
+
+        msg_retrigger = _get_propose_downstream_msg_retrigger(
+            self.service_config.comment_command_prefix
         )
         body_msg = (
             f"Packit failed on creating pull-requests in dist-git:\n\n"
@@ -246,13 +278,12 @@ class ProposeDownstreamHandler(RetriableJobHandler):
             trigger_model=self.data.db_trigger,
         )
 
-        for branch in self.propose_downstream_helper.branches:
-            propose_downstream_target = ProposeDownstreamTargetModel.create(
-                status=ProposeDownstreamTargetStatus.queued, branch=branch
-            )
-            propose_downstream_model.propose_downstream_targets.append(
-                propose_downstream_target
+        propose_downstream_model.propose_downstream_targets.extend(
+            ProposeDownstreamTargetModel.create_for_branches(
+                status=ProposeDownstreamTargetStatus.queued,
+                branches=self.propose_downstream_helper.branches,
             )
+        )
 
         return propose_downstream_model
 
@@ -264,12 +295,7 @@ class ProposeDownstreamHandler(RetriableJobHandler):
         self.local_project = LocalProject(
             git_project=self.project,
             working_dir=self.service_config.command_handler_work_dir,
-            cache=RepositoryCache(
-                cache_path=self.service_config.repository_cache,
-                add_new=self.service_config.add_repositories_to_repository_cache,
-            )
-            if self.service_config.repository_cache
-            else None,
+            cache=self.service_config.get_repository_cache(),
         )
 
         self.api = PackitAPI(
@@ -280,27 +306,31 @@ class ProposeDownstreamHandler(RetriableJobHandler):
 
         errors = {}
         propose_downstream_model = self._get_or_create_propose_downstream_run()
-        branches_to_run = [
-            target.branch
-            for target in propose_downstream_model.propose_downstream_targets
-        ]
-        logger.debug(f"Branches to run propose downstream: {branches_to_run}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Branches to run propose downstream: %s",
+                [
+                    target.branch
+                    for target in propose_downstream_model.propose_downstream_targets
+                ],
+            )
+
+        # skip submitting a branch if we already did that (even if it failed)
+        targets_to_run = []
+        for target in propose_downstream_model.propose_downstream_targets:
+            if target.status in PROPOSE_DOWNSTREAM_TARGET_STATUSES_TO_RUN:
+                targets_to_run.append(target)
+            else:
+                logger.debug(
+                    "Skipping propose downstream for branch %s "
+                    "that was already processed.",
+                    target.branch,
+                )
 
         try:
-            for model in propose_downstream_model.propose_downstream_targets:
+            for model in targets_to_run:
                 branch = model.branch
-                # skip submitting a branch if we already did that (even if it failed)
-                if model.status not in [
-                    ProposeDownstreamTargetStatus.running,
-                    ProposeDownstreamTargetStatus.retry,
-                    ProposeDownstreamTargetStatus.queued,
-                ]:
-                    logger.debug(
-                        f"Skipping propose downstream for branch {branch} "
-                        f"that was already processed."
-                    )
-                    continue
-                logger.debug(f"Running propose downstream for {branch}")
+                logger.debug("Running propose downstream for %s", branch)
                 model.set_status(status=ProposeDownstreamTargetStatus.running)
                 url = get_propose_downstream_info_url(model.id)
                 buffer, handler = gather_packit_logs_to_buffer(
@@ -347,7 +377,7 @@ class ProposeDownstreamHandler(RetriableJobHandler):
                         },
                     )
                 except Exception as ex:
-                    logger.debug(f"Propose downstream failed: {ex}")
+                    logger.debug("Propose downstream failed: %s", ex)
                     # eat the exception and continue with the execution
                     model.set_status(status=ProposeDownstreamTargetStatus.error)
                     self.propose_downstream_helper.report_status_to_branch(
@@ -367,7 +397,9 @@ class ProposeDownstreamHandler(RetriableJobHandler):
             # 1. the dist-git repo is cloned on worker, not sandbox
             # 2. it's stored in /tmp, not in the mirrored sandbox PV
             # 3. it's not being cleaned up and it wastes pod's filesystem space
-            shutil.rmtree(self.api.dg.local_project.working_dir)
+            # it has to be removed by this process since it's local to the pod,
+            # but the task doesn't need to wait for it
+            remove_dir_in_background(self.api.dg.local_project.working_dir)
 
         if errors:
             self._report_errors_for_each_branch(errors)
@@ -381,6 +413,49 @@ class ProposeDownstreamHandler(RetriableJobHandler):
         return TaskResults(success=True, details={})
 
 
+# FAS groups of the users: {user: (expiration as in monotonic(), groups)}
+_USER_GROUPS_CACHE: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+_USER_GROUPS_CACHE_LOCK = Lock()
+FAS_USER_GROUPS_CACHE_TTL = 300
+FAS_USER_GROUPS_CACHE_MAXSIZE = 4096
+
+
+def _get_cached_user_groups(user: str) -> Optional[FrozenSet[str]]:
+    """
+    Get the FAS groups of the user if they were fetched in the last
+    FAS_USER_GROUPS_CACHE_TTL seconds.
+    """
+    with _USER_GROUPS_CACHE_LOCK:
+        cached = _USER_GROUPS_CACHE.get(user)
+        if cached is None:
+            return None
+        expiration, groups = cached
+        if expiration < monotonic():
+            del _USER_GROUPS_CACHE[user]
+            return None
+        return groups
+
+
+def _cache_user_groups(user: str, groups: FrozenSet[str]) -> None:
+    """
+    Cache the FAS groups of the user for FAS_USER_GROUPS_CACHE_TTL seconds.
+
+    The expired entries are dropped first and if the cache is still full,
+    the oldest entries are evicted to keep at most FAS_USER_GROUPS_CACHE_MAXSIZE users.
+    """
+    now = monotonic()
+    with _USER_GROUPS_CACHE_LOCK:
+        _USER_GROUPS_CACHE.pop(user, None)
+        if len(_USER_GROUPS_CACHE) >= FAS_USER_GROUPS_CACHE_MAXSIZE:
+            for cached_user, (expiration, _) in list(_USER_GROUPS_CACHE.items()):
+                if expiration < now:
+                    del _USER_GROUPS_CACHE[cached_user]
+        while len(_USER_GROUPS_CACHE) >= FAS_USER_GROUPS_CACHE_MAXSIZE:
+            # dicts keep the insertion order, the first entry is the oldest one
+            del _USER_GROUPS_CACHE[next(iter(_USER_GROUPS_CACHE))]
+        _USER_GROUPS_CACHE[user] = (now + FAS_USER_GROUPS_CACHE_TTL, groups)
+
+
 @configured_as(job_type=JobType.koji_build)
 @run_for_comment(command="koji-build")
 @reacts_to(event=PushPagureEvent)
@@ -408,22 +483,31 @@ class DownstreamKojiBuildHandler(RetriableJobHandler):
         )
         self.dg_branch = event.get("git_ref")
         self._pull_request: Optional[PullRequest] = None
+        self._pull_request_searched = False
         self._packit_api = None
 
     @property
     def pull_request(self):
-        if not self._pull_request and self.data.event_dict["committer"] == "pagure":
+        if (
+            not self._pull_request_searched
+            and self.data.event_dict["committer"] == "pagure"
+        ):
+            # remember the search even if no PR was found, the list of all PRs is long
+            self._pull_request_searched = True
             logger.debug(
-                f"Getting pull request with head commit {self.data.commit_sha}"
-                f"for repo {self.project.namespace}/{self.project.repo}"
+                "Getting pull request with head commit %s for repo %s/%s",
+                self.data.commit_sha,
+                self.project.namespace,
+                self.project.repo,
+            )
+            self._pull_request = next(
+                (
+                    pr
+                    for pr in self.project.get_pr_list(status=PRStatus.all)
+                    if pr.head_commit == self.data.commit_sha
+                ),
+                None,
             )
-            prs = [
-                pr
-                for pr in self.project.get_pr_list(status=PRStatus.all)
-                if pr.head_commit == self.data.commit_sha
-            ]
-            if prs:
-                self._pull_request = prs[0]
         return self._pull_request
 
     @property
@@ -438,7 +522,8 @@ class DownstreamKojiBuildHandler(RetriableJobHandler):
 
     def get_pr_author(self):
         """Get the login of the author of the PR (if there is any corresponding PR)."""
-        return self.pull_request.author if self.pull_request else None
+        pull_request = self.pull_request
+        return pull_request.author if pull_request else None
 
     def is_packager(self, user):
         """Check that the given FAS user
@@ -449,14 +534,18 @@ class DownstreamKojiBuildHandler(RetriableJobHandler):
         Returns:
             true if a packager false otherwise
         """
-        self.packit_api.init_kerberos_ticket()
-        client = Client(FASJSON_URL)
-        try:
-            groups = client.list_user_groups(username=user)
-        except APIError:
-            logger.debug(f"Unable to get groups for user {user}.")
-            return False
-        return "packager" in [group["groupname"] for group in groups.result]
+        groups = _get_cached_user_groups(user)
+        if groups is None:
+            self.packit_api.init_kerberos_ticket()
+            client = Client(FASJSON_URL)
+            try:
+                response = client.list_user_groups(username=user)
+            except APIError:
+                logger.debug("Unable to get groups for user %s.", user)
+                return False
+            groups = frozenset(group["groupname"] for group in response.result)
+            _cache_user_groups(user, groups)
+        return "packager" in groups
 
     def pre_check(self) -> bool:
         if self.data.event_type in (PushPagureEvent.__name__,):
@@ -475,7 +564,7 @@ class DownstreamKojiBuildHandler(RetriableJobHandler):
 
             if self.data.event_dict["committer"] == "pagure":
                 pr_author = self.get_pr_author()
-                logger.debug(f"PR author: {pr_author}")
+                logger.debug("PR author: %s", pr_author)
                 if pr_author not in self.job_config.allowed_pr_authors:
                     logger.info(
                         f"Push event {self.data.identifier} with corresponding PR created by"
@@ -485,7 +574,7 @@ class DownstreamKojiBuildHandler(RetriableJobHandler):
                     return False
             else:
                 committer = self.data.event_dict["committer"]
-                logger.debug(f"Committer: {committer}")
+                logger.debug("Committer: %s", committer)
                 if committer not in self.job_config.allowed_committers:
                     logger.info(
                         f"Push event {self.data.identifier} done by "
@@ -496,7 +585,7 @@ class DownstreamKojiBuildHandler(RetriableJobHandler):
         elif self.data.event_type in (PullRequestCommentPagureEvent.__name__,):
             commenter = self.data.actor
             logger.debug(
-                f"Triggering downstream koji build through comment by: {commenter}"
+                "Triggering downstream koji build through comment by: %s", commenter
             )
             if not self.is_packager(commenter):
                 logger.info(
@@ -511,12 +600,7 @@ class DownstreamKojiBuildHandler(RetriableJobHandler):
         self.local_project = LocalProject(
             git_project=self.project,
             working_dir=self.service_config.command_handler_work_dir,
-            cache=RepositoryCache(
-                cache_path=self.service_config.repository_cache,
-                add_new=self.service_config.add_repositories_to_repository_cache,
-            )
-            if self.service_config.repository_cache
-            else None,
+            cache=self.service_config.get_repository_cache(),
         )
         branch = (
             self.project.get_pr(self.data.pr_id).target_branch
@@ -545,9 +629,9 @@ class DownstreamKojiBuildHandler(RetriableJobHandler):
                 raise ex
 
             logger.debug(
-                f"Issue repository configured. We will create "
-                f"a new issue in {self.job_config.issue_repository}"
-                "or update the existing one."
+                "Issue repository configured. We will create "
+                "a new issue in %s or update the existing one.",
+                self.job_config.issue_repository,
             )
 
             issue_repo = self.service_config.get_project(
@@ -9,7 +9,6 @@ import logging
 from datetime import datetime
 from typing import Optional
 
-from ogr.abstract import GitProject
 from packit.config import (
     JobConfig,
     JobType,
@@ -84,7 +83,6 @@ class KojiBuildHandler(JobHandler):
 
         # lazy property
         self._koji_build_helper: Optional[KojiBuildJobHelper] = None
-        self._project: Optional[GitProject] = None
 
     @property
     def koji_build_helper(self) -> KojiBuildJobHelper:
@@ -4,11 +4,15 @@
 import collections
 import datetime
 import logging
-from typing import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, Iterable, List, Optional
 
 import copr.v3
 import requests
 from copr.v3 import Client as CoprClient
+from packit.config import PackageConfig
+from requests.adapters import HTTPAdapter
 
 from packit_service.constants import (
     COPR_API_FAIL_STATE,
@@ -33,6 +37,35 @@ from packit_service.worker.jobs import SteveJobs
 
 logger = logging.getLogger(__name__)
 
+# number of the Copr builds/TF pipelines fetched at once when checking the pending ones
+COPR_API_CONCURRENCY = 8
+TESTING_FARM_API_CONCURRENCY = 8
+# the recently submitted builds are still checked by their own babysit_copr_build
+# tasks, the periodic check only needs to catch up with the older ones
+PENDING_COPR_BUILDS_MIN_AGE = datetime.timedelta(hours=1)
+# a Copr build that was not fetched (yet or because of an error),
+# as opposed to None for a build that is no longer available
+_COPR_BUILD_NOT_FETCHED = object()
+
+
+@lru_cache(maxsize=1)
+def _get_copr_client() -> CoprClient:
+    """Copr client shared by all the checks run by the worker."""
+    return CoprClient.create_from_config_file()
+
+
+def load_json_response(response: requests.Response):
+    """
+    Decodes the JSON body of the response, with orjson if it's available
+    since it's considerably faster than the json module used by requests.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return response.json()
+
+    return orjson.loads(response.content)
+
 
 def check_pending_testing_farm_runs() -> None:
     """Checks the status of pending TFT runs and updates it if needed."""
@@ -43,22 +76,44 @@ def check_pending_testing_farm_runs() -> None:
         TestingFarmResult.queued,
         TestingFarmResult.running,
     )
-    pending_test_runs = TFTTestRunTargetModel.get_all_by_status(*not_completed)
-    for run in pending_test_runs:
-        logger.debug(f"Checking status of TF pipeline {run.pipeline_id}")
-        # .submitted_time can be None, we'll set it later
-        if run.submitted_time:
-            elapsed = current_time - run.submitted_time
-            if elapsed.total_seconds() > DEFAULT_JOB_TIMEOUT:
-                logger.info(
-                    f"TF pipeline {run.pipeline_id} has been running for "
-                    f"{elapsed.total_seconds()}, probably an internal error occurred. "
-                    "Not checking it anymore."
+    # the runs which have been running for too long are not checked anymore,
+    # probably an internal error occurred
+    expired = TFTTestRunTargetModel.expire_stale(
+        current_time - datetime.timedelta(seconds=DEFAULT_JOB_TIMEOUT), *not_completed
+    )
+    if expired:
+        logger.info(
+            f"{expired} TF pipeline(s) running for more than {DEFAULT_JOB_TIMEOUT}s "
+            "set to error, not checking them anymore."
+        )
+    test_runs_to_check = list(
+        TFTTestRunTargetModel.get_all_by_status(*not_completed, eager=True)
+    )
+
+    if not test_runs_to_check:
+        return
+
+    # get the states of the pipelines concurrently over kept-alive connections,
+    # the runs are updated sequentially since they share the DB session
+    with requests.Session() as session:
+        session.mount(
+            TESTING_FARM_API_URL,
+            HTTPAdapter(pool_maxsize=TESTING_FARM_API_CONCURRENCY),
+        )
+        with ThreadPoolExecutor(
+            max_workers=min(TESTING_FARM_API_CONCURRENCY, len(test_runs_to_check))
+        ) as executor:
+            responses = list(
+                executor.map(
+                    lambda run: session.get(
+                        f"{TESTING_FARM_API_URL}requests/{run.pipeline_id}"
+                    ),
+                    test_runs_to_check,
                 )
-                run.set_status(TestingFarmResult.error)
-                continue
-        run_url = f"{TESTING_FARM_API_URL}requests/{run.pipeline_id}"
-        response = requests.get(run_url)
+            )
+
+    for run, response in zip(test_runs_to_check, responses):
+        logger.debug(f"Checking status of TF pipeline {run.pipeline_id}")
         if not response.ok:
             logger.info(
                 f"Failed to obtain state of TF pipeline {run.pipeline_id}. "
@@ -67,7 +122,7 @@ def check_pending_testing_farm_runs() -> None:
             run.set_status(TestingFarmResult.error)
             continue
 
-        details = response.json()
+        details = load_json_response(response)
         (
             project_url,
             ref,
@@ -99,9 +154,10 @@ def check_pending_testing_farm_runs() -> None:
             created=created,
             identifier=identifier,
         )
+        # we already have the run, no need to look it up by the pipeline ID again
+        event.db_trigger = run.get_trigger_object()
 
-        package_config = event.get_package_config()
-        if not package_config:
+        if not event.package_config:
             logger.info(f"No config found for {run.pipeline_id}. Skipping.")
             continue
 
@@ -122,13 +178,45 @@ def check_pending_testing_farm_runs() -> None:
 
 def check_pending_copr_builds() -> None:
     """Checks the status of pending copr builds and updates it if needed."""
-    pending_copr_builds = CoprBuildTargetModel.get_all_by_status("pending")
-    builds_grouped_by_id = collections.defaultdict(list)
+    current_time = datetime.datetime.utcnow()
+    pending_copr_builds = CoprBuildTargetModel.get_all_by_status(
+        "pending", submitted_before=current_time - PENDING_COPR_BUILDS_MIN_AGE
+    )
+    pending_builds_grouped_by_id = collections.defaultdict(list)
     for build in pending_copr_builds:
-        builds_grouped_by_id[build.build_id].append(build)
+        pending_builds_grouped_by_id[build.build_id].append(build)
+    # don't ask Copr about the builds we won't check anymore
+    builds_grouped_by_id = {}
+    for build_id, builds in pending_builds_grouped_by_id.items():
+        builds_to_check = drop_timed_out_copr_builds(build_id, builds, current_time)
+        if builds_to_check:
+            builds_grouped_by_id[build_id] = builds_to_check
 
-    for build_id, builds in builds_grouped_by_id.items():
-        update_copr_builds(build_id, builds)
+    if not builds_grouped_by_id:
+        return
+
+    # the requests to Copr are the slow part, fetch the builds concurrently
+    # (the updates need to run sequentially since they share the DB session)
+    copr_client = _get_copr_client()
+    with ThreadPoolExecutor(
+        max_workers=min(COPR_API_CONCURRENCY, len(builds_grouped_by_id))
+    ) as executor:
+        copr_builds = list(
+            executor.map(partial(get_copr_build, copr_client), builds_grouped_by_id)
+        )
+
+    for (build_id, builds), build_copr in zip(
+        builds_grouped_by_id.items(), copr_builds
+    ):
+        if build_copr is _COPR_BUILD_NOT_FETCHED:
+            # the failure was logged, the builds are checked again next time
+            continue
+        update_copr_builds(
+            build_id,
+            builds,
+            copr_client=copr_client,
+            build_copr=build_copr,
+        )
 
 
 def check_copr_build(build_id: int) -> bool:
@@ -148,10 +236,77 @@ def check_copr_build(build_id: int) -> bool:
     if not builds:
         logger.warning(f"Copr build {build_id} not in DB.")
         return True
+    # don't ask Copr about the builds we won't check anymore
+    builds = drop_timed_out_copr_builds(build_id, builds)
+    if not builds:
+        return True
     return update_copr_builds(build_id, builds)
 
 
-def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"]) -> bool:
+def drop_timed_out_copr_builds(
+    build_id: int,
+    builds: Iterable["CoprBuildTargetModel"],
+    current_time: Optional[datetime.datetime] = None,
+) -> List["CoprBuildTargetModel"]:
+    """
+    Sets the builds that have been running for too long to error status.
+
+    Args:
+        build_id (int): ID of the copr build.
+        builds (Iterable[CoprBuildTargetModel]): List of builds corresponding to
+            the given ``build_id``.
+        current_time (Optional[datetime.datetime]): Time to compare the submitted
+            times with, defaults to now.
+
+    Returns:
+        List[CoprBuildTargetModel]: The builds which have not timed out.
+    """
+    current_time = current_time or datetime.datetime.utcnow()
+    builds_to_check, timed_out_ids = [], []
+    for build in builds:
+        elapsed = current_time - build.build_submitted_time
+        if elapsed.total_seconds() > DEFAULT_JOB_TIMEOUT:
+            logger.info(
+                f"The build {build_id} has been running for "
+                f"{elapsed.total_seconds()}, probably an internal error"
+                f"occurred. Not checking it anymore."
+            )
+            timed_out_ids.append(build.id)
+            continue
+        builds_to_check.append(build)
+    if timed_out_ids:
+        CoprBuildTargetModel.bulk_set_status(timed_out_ids, "error")
+    return builds_to_check
+
+
+def get_copr_build(copr_client: CoprClient, build_id: int):
+    """
+    Get the build from Copr.
+
+    Args:
+        copr_client (CoprClient): Client to use.
+        build_id (int): ID of the copr build.
+
+    Returns:
+        The Copr build, None if it is no longer available
+        or _COPR_BUILD_NOT_FETCHED if the request failed.
+    """
+    try:
+        return copr_client.build_proxy.get(build_id)
+    except copr.v3.CoprNoResultException:
+        return None
+    except Exception as ex:
+        # a failure for one build must not stop checking the others
+        logger.warning(f"Failed to get the copr build {build_id}: {ex!r}")
+        return _COPR_BUILD_NOT_FETCHED
+
+
+def update_copr_builds(
+    build_id: int,
+    builds: Iterable["CoprBuildTargetModel"],
+    copr_client: Optional[CoprClient] = None,
+    build_copr=_COPR_BUILD_NOT_FETCHED,
+) -> bool:
     """
     Updates the state of copr builds if they have ended.
 
@@ -159,20 +314,25 @@ def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"])
         build_id (int): ID of the copr build to update.
         builds (Iterable[CoprBuildTargetModel]): List of builds corresponding to
             the given ``build_id``.
+        copr_client (Optional[CoprClient]): Client to use, the shared one by default.
+        build_copr: The already fetched Copr build (None if it is no longer
+            available), if not given, the build is fetched here.
 
     Returns:
         bool: Whether the run was successful, False signals the need to retry.
     """
-    copr_client = CoprClient.create_from_config_file()
-    try:
-        build_copr = copr_client.build_proxy.get(build_id)
-    except copr.v3.CoprNoResultException:
+    if copr_client is None:
+        copr_client = _get_copr_client()
+    if build_copr is _COPR_BUILD_NOT_FETCHED:
+        build_copr = get_copr_build(copr_client, build_id)
+        if build_copr is _COPR_BUILD_NOT_FETCHED:
+            return False
+    if build_copr is None:
         logger.info(
             f"Copr build {build_id} no longer available. Setting it to error status and "
             f"not checking it anymore."
         )
-        for build in builds:
-            build.set_status("error")
+        CoprBuildTargetModel.bulk_set_status([build.id for build in builds], "error")
         return True
 
     if not build_copr.ended_on:
@@ -181,24 +341,32 @@ def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"])
 
     logger.info(f"The status is {build_copr.state!r}.")
 
-    current_time = datetime.datetime.utcnow()
+    pending_builds = []
     for build in builds:
-        elapsed = current_time - build.build_submitted_time
-        if elapsed.total_seconds() > DEFAULT_JOB_TIMEOUT:
-            logger.info(
-                f"The build {build_id} has been running for "
-                f"{elapsed.total_seconds()}, probably an internal error"
-                f"occurred. Not checking it anymore."
-            )
-            build.set_status("error")
-            continue
         if build.status != "pending":
             logger.info(
                 f"DB state says {build.status!r}, "
                 "things were taken care of already, skipping."
             )
             continue
-        chroot_build = copr_client.build_chroot_proxy.get(build_id, build.target)
+        pending_builds.append(build)
+    if not pending_builds:
+        return True
+
+    # get all the chroots of the build at once instead of one by one
+    chroot_builds = {
+        chroot_build.name: chroot_build
+        for chroot_build in copr_client.build_chroot_proxy.get_list(build_id)
+    }
+    package_configs: Dict[str, Optional[PackageConfig]] = {}
+    for build in pending_builds:
+        chroot_build = chroot_builds.get(build.target)
+        if not chroot_build:
+            logger.warning(
+                f"Chroot {build.target} of the copr build {build_id} is missing "
+                f"in the Copr response, not updating its status."
+            )
+            continue
         event = AbstractCoprBuildEvent(
             topic=FedmsgTopic.copr_build_finished.value,
             build_id=build_id,
@@ -217,8 +385,12 @@ def update_copr_builds(build_id: int, builds: Iterable["CoprBuildTargetModel"])
             timestamp=chroot_build.ended_on,
         )
 
-        package_config = event.get_package_config()
-        if not package_config:
+        # the builds usually share the commit, get its config only once
+        if build.commit_sha in package_configs:
+            event.package_config = package_configs[build.commit_sha]
+        else:
+            package_configs[build.commit_sha] = event.package_config
+        if not event.package_config:
             logger.info(f"No config found for {build_id}. Skipping.")
             continue
 
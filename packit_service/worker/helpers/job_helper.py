@@ -13,7 +13,6 @@ from packit.api import PackitAPI
 from packit.config import JobConfig
 from packit.config.package_config import PackageConfig
 from packit.local_project import LocalProject
-from packit.utils.repo import RepositoryCache
 from packit_service.config import Deployment, ServiceConfig
 from packit_service.models import PipelineModel, JobTriggerModel
 from packit_service.worker.events import EventData
@@ -61,12 +60,7 @@ class BaseJobHelper:
                 working_dir=self.service_config.command_handler_work_dir,
                 ref=self.metadata.git_ref,
                 pr_id=self.metadata.pr_id,
-                cache=RepositoryCache(
-                    cache_path=self.service_config.repository_cache,
-                    add_new=self.service_config.add_repositories_to_repository_cache,
-                )
-                if self.service_config.repository_cache
-                else None,
+                cache=self.service_config.get_repository_cache(),
                 merge_pr=self.package_config.merge_pr_in_ci,
             )
         return self._local_project
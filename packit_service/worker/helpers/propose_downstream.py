@@ -43,8 +43,10 @@ class ProposeDownstreamJobHelper(BaseJobHelper):
         self.branches_override = branches_override
         self.msg_retrigger: str = ""
         self._check_names: Optional[List[str]] = None
+        self._branches: Optional[Set[str]] = None
         self._default_dg_branch: Optional[str] = None
         self._job: Optional[JobConfig] = None
+        self._job_searched = False
 
     @classmethod
     def get_check_cls(cls, branch: str = None, identifier: Optional[str] = None) -> str:
@@ -66,7 +68,7 @@ class ProposeDownstreamJobHelper(BaseJobHelper):
 
         e.g. ["propose-downstream:f34", "propose-downstream:f35"]
         """
-        if not self._check_names:
+        if self._check_names is None:
             self._check_names = [self.get_check(branch) for branch in self.branches]
         return self._check_names
 
@@ -121,14 +123,17 @@ class ProposeDownstreamJobHelper(BaseJobHelper):
         """
         Return all valid branches from config.
         """
-        branches = get_branches(
-            *self.job.dist_git_branches, default=self.default_dg_branch
-        )
-        if self.branches_override:
-            logger.debug(f"Branches override: {self.branches_override}")
-            branches = branches & self.branches_override
+        # reported to for each branch, don't resolve the aliases again
+        if self._branches is None:
+            branches = get_branches(
+                *self.job.dist_git_branches, default=self.default_dg_branch
+            )
+            if self.branches_override:
+                logger.debug("Branches override: %s", self.branches_override)
+                branches = branches & self.branches_override
+            self._branches = branches
 
-        return branches
+        return self._branches
 
     @property
     def job(self) -> Optional[JobConfig]:
@@ -136,7 +141,9 @@ class ProposeDownstreamJobHelper(BaseJobHelper):
         Check if there is JobConfig for propose downstream defined
         :return: JobConfig or None
         """
-        if not self._job:
+        if not self._job_searched:
+            # the result does not change, remember it even if no job was found
+            self._job_searched = True
             for job in [self.job_config] + self.package_config.jobs:
                 if are_job_types_same(job.type, self.job_type) and (
                     self.db_trigger
@@ -42,8 +42,8 @@ from packit_service.worker.handlers.abstract import (
     MAP_COMMENT_TO_HANDLER,
     MAP_JOB_TYPE_TO_HANDLER,
     MAP_REQUIRED_JOB_TYPE_TO_HANDLER,
-    SUPPORTED_EVENTS_FOR_HANDLER,
     MAP_CHECK_PREFIX_TO_HANDLER,
+    get_handlers_for_event_and_job_type,
     get_packit_commands_from_comment,
 )
 from packit_service.worker.helpers.build import (
@@ -52,7 +52,7 @@ from packit_service.worker.helpers.build import (
     BaseBuildJobHelper,
 )
 from packit_service.worker.helpers.propose_downstream import ProposeDownstreamJobHelper
-from packit_service.worker.monitoring import Pushgateway, measure_time
+from packit_service.worker.monitoring import get_pushgateway, measure_time
 from packit_service.worker.parser import Parser
 from packit_service.worker.reporting import BaseCommitStatus
 from packit_service.worker.result import TaskResults
@@ -77,7 +77,7 @@ def get_handlers_for_comment(
     if not commands:
         return set()
 
-    handlers = MAP_COMMENT_TO_HANDLER[commands[0]]
+    handlers = MAP_COMMENT_TO_HANDLER.get(commands[0], set())
     if not handlers:
         logger.debug(f"Command {commands[0]} not supported by packit.")
     return handlers
@@ -93,7 +93,7 @@ def get_handlers_for_check_rerun(check_name_job: str) -> Set[Type[JobHandler]]:
     Returns:
         Set of handlers that are triggered by a check rerun.
     """
-    handlers = MAP_CHECK_PREFIX_TO_HANDLER[check_name_job]
+    handlers = MAP_CHECK_PREFIX_TO_HANDLER.get(check_name_job, set())
     if not handlers:
         logger.debug(
             f"Rerun for check with {check_name_job} prefix not supported by packit."
@@ -169,7 +169,7 @@ class SteveJobs:
             self.event, IssueCommentEvent
         ) and self.is_fas_verification_comment(self.event.comment):
             if GithubFasVerificationHandler(
-                package_config=None, job_config=None, event=self.event.get_dict()
+                package_config=None, job_config=None, event=self.event.get_dict_cached()
             ).pre_check():
                 self.event.comment_object.add_reaction(COMMENT_REACTION)
                 GithubFasVerificationHandler.get_signature(
@@ -211,7 +211,7 @@ class SteveJobs:
             "service_config": self.service_config,
             "package_config": self.event.package_config,
             "project": self.event.project,
-            "metadata": EventData.from_event_dict(self.event.get_dict()),
+            "metadata": EventData.from_event_dict(self.event.get_dict_cached()),
             "db_trigger": self.event.db_trigger,
             "job_config": job_config,
         }
@@ -413,7 +413,7 @@ class SteveJobs:
         handler = handler_kls(
             package_config=self.event.package_config,
             job_config=job_config,
-            event=self.event.get_dict(),
+            event=self.event.get_dict_cached(),
         )
         if not handler.pre_check():
             return False
@@ -561,15 +561,10 @@ class SteveJobs:
             ):
                 continue
 
-            for handler in (
-                MAP_JOB_TYPE_TO_HANDLER[job.type]
-                | MAP_REQUIRED_JOB_TYPE_TO_HANDLER[job.type]
-            ):
-                if self.is_handler_matching_the_event(
-                    handler=handler,
-                    allowed_handlers=handlers_triggered_by_job,
-                ):
-                    matching_handlers.add(handler)
+            handlers = get_handlers_for_event_and_job_type(type(self.event), job.type)
+            if handlers_triggered_by_job is not None:
+                handlers = handlers & handlers_triggered_by_job
+            matching_handlers.update(handlers)
 
         if not matching_handlers:
             logger.debug(
@@ -578,29 +573,6 @@ class SteveJobs:
 
         return matching_handlers
 
-    def is_handler_matching_the_event(
-        self,
-        handler: Type[JobHandler],
-        allowed_handlers: Set[Type[JobHandler]],
-    ) -> bool:
-        """
-        Decides whether handler matches to comment or check rerun job and given event
-        supports handler.
-
-        Args:
-            handler: Handler which we are observing whether it is matching to job.
-            allowed_handlers: Set of handlers that are triggered by a comment or check rerun
-             job.
-        """
-        handler_matches_to_comment_or_check_rerun_job = (
-            allowed_handlers is None or handler in allowed_handlers
-        )
-
-        return (
-            isinstance(self.event, tuple(SUPPORTED_EVENTS_FOR_HANDLER[handler]))
-            and handler_matches_to_comment_or_check_rerun_job
-        )
-
     def get_config_for_handler_kls(
         self, handler_kls: Type[JobHandler]
     ) -> List[JobConfig]:
@@ -628,7 +600,7 @@ class SteveJobs:
 
         matching_jobs: List[JobConfig] = []
         for job in jobs_matching_trigger:
-            if handler_kls in MAP_JOB_TYPE_TO_HANDLER[job.type]:
+            if handler_kls in MAP_JOB_TYPE_TO_HANDLER.get(job.type, ()):
                 matching_jobs.append(job)
 
         if not matching_jobs:
@@ -636,7 +608,7 @@ class SteveJobs:
                 "No config found, let's see the jobs that requires this handler."
             )
             for job in jobs_matching_trigger:
-                if handler_kls in MAP_REQUIRED_JOB_TYPE_TO_HANDLER[job.type]:
+                if handler_kls in MAP_REQUIRED_JOB_TYPE_TO_HANDLER.get(job.type, ()):
                     matching_jobs.append(job)
 
         if not matching_jobs:
@@ -662,7 +634,7 @@ class SteveJobs:
             handler: Handler that is being used.
             number_of_build_targets: Number of build targets in case of CoprBuildHandler.
         """
-        pushgateway = Pushgateway()
+        pushgateway = get_pushgateway()
         response_time = measure_time(
             end=task_accepted_time, begin=self.event.created_at
         )
@@ -4,8 +4,10 @@
 import logging
 import os
 from datetime import datetime, timezone
+from typing import Optional
 
 from prometheus_client import CollectorRegistry, Counter, push_to_gateway, Histogram
+from prometheus_client.metrics import MetricWrapperBase
 
 logger = logging.getLogger(__name__)
 
@@ -133,12 +135,42 @@ class Pushgateway:
             ),
         )
 
+    def reset(self):
+        """
+        Reset the values of all the metrics.
+        """
+        for metric in vars(self).values():
+            if not isinstance(metric, MetricWrapperBase):
+                continue
+            if metric._labelnames:
+                metric.clear()
+            else:
+                # there is no public method for resetting e.g. a histogram
+                metric._metric_init()
+
     def push(self):
         if not (self.pushgateway_address and self.worker_name):
             logger.debug("Pushgateway address or worker name not defined.")
-            return
+        else:
+            logger.info("Pushing the metrics to pushgateway.")
+            push_to_gateway(
+                self.pushgateway_address, job=self.worker_name, registry=self.registry
+            )
+        # the instance is shared within the worker process, but each push
+        # replaces the metrics of the worker and so it has to contain only
+        # the values observed since the previous push
+        self.reset()
 
-        logger.info("Pushing the metrics to pushgateway.")
-        push_to_gateway(
-            self.pushgateway_address, job=self.worker_name, registry=self.registry
-        )
+
+_pushgateway: Optional[Pushgateway] = None
+
+
+def get_pushgateway() -> Pushgateway:
+    """
+    Get the Pushgateway instance shared within the worker process
+    so that the registry and metrics are not created for each task again.
+    """
+    global _pushgateway
+    if _pushgateway is None:
+        _pushgateway = Pushgateway()
+    return _pushgateway
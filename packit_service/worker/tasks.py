@@ -209,6 +209,8 @@ def run_testing_farm_results_handler(
     name=TaskName.propose_downstream,
     base=HandlerTaskWithRetry,
     queue="long-running",
+    # the state of the run with its targets and their logs is stored in the DB models
+    ignore_result=True,
 )
 def run_propose_downstream_handler(
     self,
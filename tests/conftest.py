@@ -21,6 +21,7 @@ from packit_service.worker.events import (
     MergeRequestGitlabEvent,
     PushPagureEvent,
 )
+from packit_service.worker.handlers.abstract import Handler
 from packit_service.worker.parser import Parser
 from tests.spellbook import SAVED_HTTPD_REQS, DATA_DIR, load_the_message_from_file
 
@@ -50,6 +51,8 @@ def global_service_config():
     # So just prod reacts to configs without packit_instances defined.
     service_config.deployment = Deployment.prod
     ServiceConfig.service_config = service_config
+    # drop the config cached by the handlers
+    Handler._service_config = None
 
 
 @pytest.fixture()
@@ -2,10 +2,11 @@
 # SPDX-License-Identifier: MIT
 
 import datetime
+import json
 
 import pytest
 import requests
-from copr.v3 import Client, CoprNoResultException
+from copr.v3 import Client, CoprNoResultException, CoprRequestException
 from flexmock import flexmock
 
 import packit_service.worker.helpers.build.babysit
@@ -29,6 +30,33 @@ from packit_service.worker.handlers import (
 )
 
 
+def tf_response(details: dict):
+    return flexmock(
+        json=lambda: details, content=json.dumps(details).encode(), ok=lambda: True
+    )
+
+
+@pytest.fixture()
+def pr_trigger():
+    return flexmock(
+        project=flexmock(
+            repo_name="repo_name",
+            namespace="the-namespace",
+            project_url="https://github.com/the-namespace/repo_name",
+        ),
+        pr_id=5,
+        job_config_trigger_type=JobConfigTriggerType.pull_request,
+        job_trigger_model_type=JobTriggerModelType.pull_request,
+        id=123,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_copr_client_cache():
+    packit_service.worker.helpers.build.babysit._get_copr_client.cache_clear()
+    yield
+
+
 def test_check_copr_build_no_build():
     flexmock(CoprBuildTargetModel).should_receive("get_all_by_build_id").with_args(
         1
@@ -39,7 +67,7 @@ def test_check_copr_build_no_build():
 def test_check_copr_build_not_ended():
     flexmock(CoprBuildTargetModel).should_receive("get_all_by_build_id").with_args(
         1
-    ).and_return([flexmock()])
+    ).and_return([flexmock(build_submitted_time=datetime.datetime.utcnow())])
     flexmock(Client).should_receive("create_from_config_file").and_return(
         flexmock(
             build_proxy=flexmock()
@@ -70,7 +98,7 @@ def test_check_copr_build_already_successful():
     assert check_copr_build(build_id=1)
 
 
-def test_check_copr_build_updated():
+def test_check_copr_build_updated(pr_trigger):
     flexmock(CoprBuildTargetModel).should_receive("get_by_build_id").and_return()
     flexmock(CoprBuildTargetModel).should_receive("get_all_by_build_id").with_args(
         1
@@ -90,19 +118,7 @@ def test_check_copr_build_updated():
                 .mock(),
             )
             .should_receive("get_trigger_object")
-            .and_return(
-                flexmock(
-                    project=flexmock(
-                        repo_name="repo_name",
-                        namespace="the-namespace",
-                        project_url="https://github.com/the-namespace/repo_name",
-                    ),
-                    pr_id=5,
-                    job_config_trigger_type=JobConfigTriggerType.pull_request,
-                    job_trigger_model_type=JobTriggerModelType.pull_request,
-                    id=123,
-                )
-            )
+            .and_return(pr_trigger)
             .mock()
         ]
     )
@@ -123,9 +139,11 @@ def test_check_copr_build_updated():
             )
             .mock(),
             build_chroot_proxy=flexmock()
-            .should_receive("get")
-            .with_args(1, "the-target")
-            .and_return(flexmock(ended_on="timestamp", state="succeeded"))
+            .should_receive("get_list")
+            .with_args(1)
+            .and_return(
+                [flexmock(name="the-target", ended_on="timestamp", state="succeeded")]
+            )
             .mock(),
         )
     )
@@ -140,6 +158,105 @@ def test_check_copr_build_updated():
     assert check_copr_build(build_id=1)
 
 
+def test_update_copr_builds_shared_target():
+    builds = [
+        flexmock(
+            status="pending",
+            build_submitted_time=datetime.datetime.utcnow(),
+            target="the-target",
+            owner="the-owner",
+            project_name="the-project-name",
+            commit_sha="123456",
+        )
+        for _ in range(2)
+    ]
+    copr_client = flexmock(
+        build_chroot_proxy=flexmock()
+        .should_receive("get_list")
+        .with_args(1)
+        .and_return(
+            [flexmock(name="the-target", ended_on="timestamp", state="succeeded")]
+        )
+        .once()
+        .mock(),
+    )
+    build_copr = flexmock(
+        ended_on=True,
+        state="completed",
+        source_package={"name": "source_package_name"},
+    )
+    flexmock(packit_service.worker.helpers.build.babysit).should_receive(
+        "AbstractCoprBuildEvent"
+    ).and_return(flexmock(package_config=None)).times(2)
+    assert update_copr_builds(1, builds, copr_client=copr_client, build_copr=build_copr)
+
+
+def test_update_copr_builds_caches_pkg_config(pr_trigger):
+    flexmock(CoprBuildTargetModel).should_receive("get_by_build_id").and_return()
+    builds = [
+        flexmock(
+            status="pending",
+            build_submitted_time=datetime.datetime.utcnow(),
+            target=target,
+            owner="the-owner",
+            project_name="the-project-name",
+            commit_sha="123456",
+            get_trigger_object=lambda: pr_trigger,
+        )
+        for target in ("fedora-37-x86_64", "fedora-rawhide-x86_64")
+    ]
+    copr_client = flexmock(
+        build_chroot_proxy=flexmock(
+            get_list=lambda build_id: [
+                flexmock(name=build.target, ended_on="timestamp", state="succeeded")
+                for build in builds
+            ]
+        ),
+    )
+    build_copr = flexmock(
+        ended_on=True,
+        state="completed",
+        source_package={"name": "source_package_name"},
+    )
+    flexmock(AbstractCoprBuildEvent).should_receive("get_package_config").and_return(
+        PackageConfig(
+            jobs=[
+                JobConfig(type=JobType.build, trigger=JobConfigTriggerType.pull_request)
+            ]
+        )
+    ).once()
+    flexmock(CoprBuildEndHandler).should_receive("run").and_return().times(2)
+    assert update_copr_builds(1, builds, copr_client=copr_client, build_copr=build_copr)
+
+
+def test_update_copr_builds_missing_chroot():
+    build = flexmock(
+        status="pending",
+        build_submitted_time=datetime.datetime.utcnow(),
+        target="the-target",
+    )
+    copr_client = flexmock(
+        build_chroot_proxy=flexmock()
+        .should_receive("get_list")
+        .with_args(1)
+        .and_return([])
+        .once()
+        .mock(),
+    )
+    flexmock(packit_service.worker.helpers.build.babysit.logger).should_receive(
+        "warning"
+    ).once()
+    flexmock(packit_service.worker.helpers.build.babysit).should_receive(
+        "AbstractCoprBuildEvent"
+    ).never()
+    assert update_copr_builds(
+        1,
+        [build],
+        copr_client=copr_client,
+        build_copr=flexmock(ended_on=True, state="completed"),
+    )
+
+
 def test_check_copr_build_not_exists():
     flexmock(Client).should_receive("create_from_config_file").and_return(
         flexmock(
@@ -150,56 +267,75 @@ def test_check_copr_build_not_exists():
             .mock()
         )
     )
-    builds = []
-    for i in range(2):
-        builds.append(flexmock(status="pending", build_id=1))
-        builds[i].should_receive("set_status").with_args("error").once()
+    builds = [
+        flexmock(
+            id=i,
+            status="pending",
+            build_id=1,
+            build_submitted_time=datetime.datetime.utcnow(),
+        )
+        for i in range(2)
+    ]
+    flexmock(CoprBuildTargetModel).should_receive("bulk_set_status").with_args(
+        [0, 1], "error"
+    ).once()
     flexmock(CoprBuildTargetModel).should_receive("get_all_by_status").with_args(
-        "pending"
+        "pending", submitted_before=datetime.datetime
     ).and_return(builds)
     check_pending_copr_builds()
 
 
 def test_check_update_copr_builds_timeout():
-    flexmock(Client).should_receive("create_from_config_file").and_return(
-        flexmock(
-            build_proxy=flexmock()
-            .should_receive("get")
-            .with_args(1)
-            .and_return(
-                flexmock(
-                    ended_on=True,
-                    state="completed",
-                    source_package={
-                        "name": "source_package_name",
-                        "url": "https://some.host/my.srpm",
-                    },
-                )
-            )
-            .mock(),
-            build_chroot_proxy=flexmock()
-            .should_receive("get")
-            .with_args(1, "the-target")
-            .and_return(flexmock(ended_on="timestamp", state="succeeded"))
-            .mock(),
-        )
+    # the timed out builds are not checked in Copr anymore
+    flexmock(Client).should_receive("create_from_config_file").never()
+    build = flexmock(
+        id=1,
+        status="pending",
+        build_id=1,
+        build_submitted_time=datetime.datetime.utcnow() - datetime.timedelta(weeks=2),
     )
+    flexmock(CoprBuildTargetModel).should_receive("bulk_set_status").with_args(
+        [1], "error"
+    ).once()
+
+    flexmock(CoprBuildTargetModel).should_receive("get_all_by_build_id").with_args(
+        1
+    ).and_return([build])
+    assert check_copr_build(build_id=1)
+
+
+def test_check_pending_copr_builds_timeout():
+    flexmock(Client).should_receive("create_from_config_file").never()
     build = flexmock(
+        id=1,
         status="pending",
         build_id=1,
         build_submitted_time=datetime.datetime.utcnow() - datetime.timedelta(weeks=2),
     )
-    build.should_receive("set_status").with_args("error").once()
+    flexmock(CoprBuildTargetModel).should_receive("bulk_set_status").with_args(
+        [1], "error"
+    ).once()
 
     flexmock(CoprBuildTargetModel).should_receive("get_all_by_status").with_args(
-        "pending"
+        "pending", submitted_before=datetime.datetime
     ).and_return([build])
-    update_copr_builds(1, [build])
+    flexmock(packit_service.worker.helpers.build.babysit).should_receive(
+        "update_copr_builds"
+    ).never()
+    check_pending_copr_builds()
+
+
+def test_copr_client_reused():
+    flexmock(Client).should_receive("create_from_config_file").and_return(
+        flexmock()
+    ).once()
+    client = packit_service.worker.helpers.build.babysit._get_copr_client()
+    assert packit_service.worker.helpers.build.babysit._get_copr_client() is client
 
 
 def test_check_pending_copr_builds_no_builds():
     flexmock(CoprBuildTargetModel).should_receive("get_all_by_status").with_args(
-        "pending"
+        "pending", submitted_before=datetime.datetime
     ).and_return([])
     flexmock(packit_service.worker.helpers.build.babysit).should_receive(
         "update_copr_builds"
@@ -208,27 +344,93 @@ def test_check_pending_copr_builds_no_builds():
 
 
 def test_check_pending_copr_builds():
-    build1 = flexmock(status="pending", build_id=1)
-    build2 = flexmock(status="pending", build_id=2)
-    build3 = flexmock(status="pending", build_id=1)
+    now = datetime.datetime.utcnow()
+    build1 = flexmock(status="pending", build_id=1, build_submitted_time=now)
+    build2 = flexmock(status="pending", build_id=2, build_submitted_time=now)
+    build3 = flexmock(status="pending", build_id=1, build_submitted_time=now)
     flexmock(CoprBuildTargetModel).should_receive("get_all_by_status").with_args(
-        "pending"
+        "pending", submitted_before=datetime.datetime
     ).and_return([build1, build2, build3])
+    copr_build1, copr_build2 = flexmock(), flexmock()
+    copr_client = flexmock(
+        build_proxy=flexmock(
+            get=lambda build_id: {1: copr_build1, 2: copr_build2}[build_id]
+        )
+    )
+    flexmock(Client).should_receive("create_from_config_file").and_return(
+        copr_client
+    ).once()
+    flexmock(packit_service.worker.helpers.build.babysit).should_receive(
+        "update_copr_builds"
+    ).with_args(
+        1, [build1, build3], copr_client=copr_client, build_copr=copr_build1
+    ).once()
     flexmock(packit_service.worker.helpers.build.babysit).should_receive(
         "update_copr_builds"
-    ).with_args(1, [build1, build3]).once()
+    ).with_args(2, [build2], copr_client=copr_client, build_copr=copr_build2).once()
+    check_pending_copr_builds()
+
+
+def test_check_pending_copr_builds_lookup_failed():
+    now = datetime.datetime.utcnow()
+    build1 = flexmock(status="pending", build_id=1, build_submitted_time=now)
+    build2 = flexmock(status="pending", build_id=2, build_submitted_time=now)
+    flexmock(CoprBuildTargetModel).should_receive("get_all_by_status").with_args(
+        "pending", submitted_before=datetime.datetime
+    ).and_return([build1, build2])
+    copr_build1 = flexmock()
+
+    def get(build_id):
+        if build_id == 2:
+            raise CoprRequestException("Connection refused")
+        return copr_build1
+
+    copr_client = flexmock(build_proxy=flexmock(get=get))
+    flexmock(Client).should_receive("create_from_config_file").and_return(
+        copr_client
+    ).once()
     flexmock(packit_service.worker.helpers.build.babysit).should_receive(
         "update_copr_builds"
-    ).with_args(2, [build2]).once()
+    ).with_args(
+        1,
+        [build1],
+        copr_client=copr_client,
+        build_copr=copr_build1,
+    ).once()
+    # the other builds are updated even though the lookup of one failed
     check_pending_copr_builds()
 
 
+def test_update_copr_builds_lookup_failed():
+    copr_client = flexmock(
+        build_proxy=flexmock()
+        .should_receive("get")
+        .with_args(1)
+        .and_raise(CoprRequestException("Connection refused"))
+        .once()
+        .mock()
+    )
+    build = flexmock(status="pending").should_receive("set_status").never().mock()
+    # the build was not fetched, it's not considered to be gone
+    assert not update_copr_builds(1, [build], copr_client=copr_client)
+
+
 def test_check_pending_testing_farm_runs_no_runs():
+    flexmock(TFTTestRunTargetModel).should_receive("expire_stale").with_args(
+        datetime.datetime,
+        TestingFarmResult.new,
+        TestingFarmResult.queued,
+        TestingFarmResult.running,
+    ).and_return(0)
     flexmock(TFTTestRunTargetModel).should_receive("get_all_by_status").with_args(
-        TestingFarmResult.new, TestingFarmResult.queued, TestingFarmResult.running
+        TestingFarmResult.new,
+        TestingFarmResult.queued,
+        TestingFarmResult.running,
+        eager=True,
     ).and_return([])
     # No request should be performed
     flexmock(requests).should_receive("get").never()
+    flexmock(requests.Session).should_receive("get").never()
     check_pending_testing_farm_runs()
 
 
@@ -240,7 +442,7 @@ def test_check_pending_testing_farm_runs_no_runs():
         None,
     ),
 )
-def test_check_pending_testing_farm_runs(created):
+def test_check_pending_testing_farm_runs(created, pr_trigger):
     pipeline_id = 1
     run = (
         flexmock(
@@ -253,36 +455,32 @@ def test_check_pending_testing_farm_runs(created):
             identifier=None,
         )
         .should_receive("get_trigger_object")
-        .and_return(
-            flexmock(
-                project=flexmock(
-                    repo_name="repo_name",
-                    namespace="the-namespace",
-                    project_url="https://github.com/the-namespace/repo_name",
-                ),
-                pr_id=5,
-                job_config_trigger_type=JobConfigTriggerType.pull_request,
-                job_trigger_model_type=JobTriggerModelType.pull_request,
-                id=123,
-            )
-        )
+        .and_return(pr_trigger)
         .mock()
     )
+    flexmock(TFTTestRunTargetModel).should_receive("expire_stale").with_args(
+        datetime.datetime,
+        TestingFarmResult.new,
+        TestingFarmResult.queued,
+        TestingFarmResult.running,
+    ).and_return(0)
     flexmock(TFTTestRunTargetModel).should_receive("get_all_by_status").with_args(
-        TestingFarmResult.new, TestingFarmResult.queued, TestingFarmResult.running
+        TestingFarmResult.new,
+        TestingFarmResult.queued,
+        TestingFarmResult.running,
+        eager=True,
     ).and_return([run]).once()
     flexmock(TFTTestRunTargetModel).should_receive("get_by_pipeline_id").with_args(
         pipeline_id=pipeline_id
     ).and_return(run)
     url = "https://api.dev.testing-farm.io/v0.1/requests/1"
-    flexmock(requests).should_receive("get").with_args(url).and_return(
-        flexmock(
-            json=lambda: {
+    flexmock(requests.Session).should_receive("get").with_args(url).and_return(
+        tf_response(
+            {
                 "id": pipeline_id,
                 "state": TestingFarmResult.passed,
                 "created": "2021-11-01 17:22:36.061250",
-            },
-            ok=lambda: True,
+            }
         )
     ).once()
     flexmock(TestingFarmResultsEvent).should_receive("get_package_config").and_return(
@@ -296,20 +494,62 @@ def test_check_pending_testing_farm_runs(created):
     check_pending_testing_farm_runs()
 
 
+def test_check_pending_testing_farm_runs_timeout():
+    flexmock(TFTTestRunTargetModel).should_receive("expire_stale").with_args(
+        datetime.datetime,
+        TestingFarmResult.new,
+        TestingFarmResult.queued,
+        TestingFarmResult.running,
+    ).and_return(1).once()
+    flexmock(TFTTestRunTargetModel).should_receive("get_all_by_status").with_args(
+        TestingFarmResult.new,
+        TestingFarmResult.queued,
+        TestingFarmResult.running,
+        eager=True,
+    ).and_return([]).once()
+    flexmock(requests.Session).should_receive("get").never()
+    check_pending_testing_farm_runs()
+
+
 @pytest.mark.parametrize(
-    "status",
+    "state",
     [TestingFarmResult.new, TestingFarmResult.queued, TestingFarmResult.running],
 )
-def test_check_pending_testing_farm_runs_timeout(status):
+def test_check_pending_testing_farm_runs_noop_on_not_completed(state):
     run = flexmock(
         pipeline_id=1,
-        status=status,
-        submitted_time=datetime.datetime.utcnow() - datetime.timedelta(weeks=2),
+        status=state,
+        submitted_time=datetime.datetime.utcnow(),
+        commit_sha="123456",
+        target="fedora-rawhide-x86_64",
+        data={},
+        identifier=None,
     )
-    run.should_receive("set_status").with_args(TestingFarmResult.error).once()
+    run.should_receive("set_status").never()
+    flexmock(TFTTestRunTargetModel).should_receive("expire_stale").with_args(
+        datetime.datetime,
+        TestingFarmResult.new,
+        TestingFarmResult.queued,
+        TestingFarmResult.running,
+    ).and_return(0)
     flexmock(TFTTestRunTargetModel).should_receive("get_all_by_status").with_args(
-        TestingFarmResult.new, TestingFarmResult.queued, TestingFarmResult.running
+        TestingFarmResult.new,
+        TestingFarmResult.queued,
+        TestingFarmResult.running,
+        eager=True,
     ).and_return([run]).once()
+    url = "https://api.dev.testing-farm.io/v0.1/requests/1"
+    flexmock(requests.Session).should_receive("get").with_args(url).and_return(
+        tf_response(
+            {
+                "id": 1,
+                "state": state,
+                "created": "2021-11-01 17:22:36.061250",
+            }
+        )
+    ).once()
+    flexmock(TestingFarmResultsEvent).should_receive("get_package_config").never()
+    flexmock(TestingFarmResultsHandler).should_receive("run").never()
     check_pending_testing_farm_runs()
 
 
@@ -317,7 +557,7 @@ def test_check_pending_testing_farm_runs_timeout(status):
     "identifier",
     [None, "first", "second"],
 )
-def test_check_pending_testing_farm_runs_identifiers(identifier):
+def test_check_pending_testing_farm_runs_identifiers(identifier, pr_trigger):
     pipeline_id = 1
     run = (
         flexmock(
@@ -330,36 +570,32 @@ def test_check_pending_testing_farm_runs_identifiers(identifier):
             identifier=identifier,
         )
         .should_receive("get_trigger_object")
-        .and_return(
-            flexmock(
-                project=flexmock(
-                    repo_name="repo_name",
-                    namespace="the-namespace",
-                    project_url="https://github.com/the-namespace/repo_name",
-                ),
-                pr_id=5,
-                job_config_trigger_type=JobConfigTriggerType.pull_request,
-                job_trigger_model_type=JobTriggerModelType.pull_request,
-                id=123,
-            )
-        )
+        .and_return(pr_trigger)
         .mock()
     )
+    flexmock(TFTTestRunTargetModel).should_receive("expire_stale").with_args(
+        datetime.datetime,
+        TestingFarmResult.new,
+        TestingFarmResult.queued,
+        TestingFarmResult.running,
+    ).and_return(0)
     flexmock(TFTTestRunTargetModel).should_receive("get_all_by_status").with_args(
-        TestingFarmResult.new, TestingFarmResult.queued, TestingFarmResult.running
+        TestingFarmResult.new,
+        TestingFarmResult.queued,
+        TestingFarmResult.running,
+        eager=True,
     ).and_return([run]).once()
     flexmock(TFTTestRunTargetModel).should_receive("get_by_pipeline_id").with_args(
         pipeline_id=pipeline_id
     ).and_return(run)
     url = "https://api.dev.testing-farm.io/v0.1/requests/1"
-    flexmock(requests).should_receive("get").with_args(url).and_return(
-        flexmock(
-            json=lambda: {
+    flexmock(requests.Session).should_receive("get").with_args(url).and_return(
+        tf_response(
+            {
                 "id": pipeline_id,
                 "state": TestingFarmResult.passed,
                 "created": "2021-11-01 17:22:36.061250",
-            },
-            ok=lambda: True,
+            }
         )
     ).once()
     flexmock(TestingFarmResultsEvent).should_receive("get_package_config").and_return(
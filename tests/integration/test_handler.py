@@ -1,8 +1,6 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
-import os
-
 import pytest
 from flexmock import flexmock
 
@@ -21,15 +19,16 @@ from packit_service.worker.handlers import (
     CoprBuildHandler,
     KojiBuildHandler,
 )
+from packit_service.worker.handlers import abstract
 from packit_service.worker.helpers.build import CoprBuildJobHelper
 from packit_service.worker.reporting import StatusReporterGithubChecks, BaseCommitStatus
 
 
 @pytest.fixture()
-def trick_p_s_with_k8s():
-    os.environ["KUBERNETES_SERVICE_HOST"] = "YEAH"  # trick p-s
-    yield
-    del os.environ["KUBERNETES_SERVICE_HOST"]
+def trick_p_s_with_k8s(monkeypatch):
+    monkeypatch.setenv("KUBERNETES_SERVICE_HOST", "YEAH")  # trick p-s
+    # the environment is checked only once, when the module is imported
+    monkeypatch.setattr(abstract, "_IN_KUBERNETES", True)
 
 
 def test_handler_cleanup(tmp_path, trick_p_s_with_k8s):
@@ -177,9 +177,13 @@ def test_issue_comment_propose_downstream_handler(
     ).and_return(propose_downstream_model, run_model).once()
 
     model = flexmock(status="queued", id=1234, branch="main")
-    flexmock(ProposeDownstreamTargetModel).should_receive("create").with_args(
-        status=ProposeDownstreamTargetStatus.queued, branch="main"
-    ).and_return(model).once()
+    flexmock(ProposeDownstreamTargetModel).should_receive(
+        "create_for_branches"
+    ).with_args(
+        status=ProposeDownstreamTargetStatus.queued, branches={"main"}
+    ).and_return(
+        [model]
+    ).once()
     flexmock(model).should_receive("set_status").with_args(
         status=ProposeDownstreamTargetStatus.running
     ).once()
@@ -535,6 +535,28 @@ def test_pr_comment_invalid_with_command_set(comment, command):
     assert len(commands) == 0
 
 
+@pytest.mark.parametrize(
+    "comment, commands",
+    (
+        ("/packit build", ["build"]),
+        ("/packit  build  ", ["build"]),
+        ("/packit\nbuild", []),
+        ("/packit\n/packit build", ["build"]),
+        ("/packit test\r\n/packit build", ["test"]),
+        ("asd\n\t/packit propose-downstream\n", ["propose-downstream"]),
+        ("/packit retest-failed now", ["retest-failed", "now"]),
+        ("/packit a b  c d  ", ["a", "b", "c d"]),
+    ),
+)
+def test_pr_comment_commands(comment, commands):
+    assert (
+        get_packit_commands_from_comment(
+            comment, packit_comment_command_prefix="/packit"
+        )
+        == commands
+    )
+
+
 @pytest.mark.parametrize(
     "comments_list, command",
     (
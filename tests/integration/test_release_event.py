@@ -77,21 +77,28 @@ def propose_downstream_model():
 
 @pytest.fixture
 def propose_downstream_target_models(fedora_branches):
-    models = []
-    for branch in fedora_branches:
-        model = flexmock(status="queued", id=1234, branch=branch)
-        models.append(model)
-        flexmock(ProposeDownstreamTargetModel).should_receive("create").with_args(
-            status=ProposeDownstreamTargetStatus.queued, branch=branch
-        ).and_return(model)
+    models = [
+        flexmock(status="queued", id=1234, branch=branch) for branch in fedora_branches
+    ]
+    flexmock(ProposeDownstreamTargetModel).should_receive(
+        "create_for_branches"
+    ).with_args(
+        status=ProposeDownstreamTargetStatus.queued, branches=set(fedora_branches)
+    ).and_return(
+        models
+    )
     yield models
 
 
 def test_dist_git_push_release_handle(github_release_webhook, propose_downstream_model):
     model = flexmock(status="queued", id=1234, branch="main")
-    flexmock(ProposeDownstreamTargetModel).should_receive("create").with_args(
-        status=ProposeDownstreamTargetStatus.queued, branch="main"
-    ).and_return(model)
+    flexmock(ProposeDownstreamTargetModel).should_receive(
+        "create_for_branches"
+    ).with_args(
+        status=ProposeDownstreamTargetStatus.queued, branches={"main"}
+    ).and_return(
+        [model]
+    )
 
     packit_yaml = (
         "{'specfile_path': 'hello-world.spec', 'synced_files': []"
@@ -568,9 +575,13 @@ def test_retry_propose_downstream_task(
     github_release_webhook, propose_downstream_model
 ):
     model = flexmock(status="queued", id=1234, branch="main")
-    flexmock(ProposeDownstreamTargetModel).should_receive("create").with_args(
-        status=ProposeDownstreamTargetStatus.queued, branch="main"
-    ).and_return(model)
+    flexmock(ProposeDownstreamTargetModel).should_receive(
+        "create_for_branches"
+    ).with_args(
+        status=ProposeDownstreamTargetStatus.queued, branches={"main"}
+    ).and_return(
+        [model]
+    )
 
     packit_yaml = (
         "{'specfile_path': 'hello-world.spec', 'synced_files': []"
@@ -672,9 +683,13 @@ def test_dont_retry_propose_downstream_task(
     github_release_webhook, propose_downstream_model
 ):
     model = flexmock(status="queued", id=1234, branch="main")
-    flexmock(ProposeDownstreamTargetModel).should_receive("create").with_args(
-        status=ProposeDownstreamTargetStatus.queued, branch="main"
-    ).and_return(model)
+    flexmock(ProposeDownstreamTargetModel).should_receive(
+        "create_for_branches"
+    ).with_args(
+        status=ProposeDownstreamTargetStatus.queued, branches={"main"}
+    ).and_return(
+        [model]
+    )
     packit_yaml = (
         "{'specfile_path': 'hello-world.spec', 'synced_files': []"
         ", jobs: [{trigger: release, job: propose_downstream, metadata: {targets:[]}}]}"
@@ -0,0 +1,90 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from flexmock import flexmock
+from kombu import serialization
+
+from packit.config import PackageConfig
+from packit_service.celerizer import register_orjson_serializer
+from packit_service.constants import CELERY_ORJSON_SERIALIZER
+from packit_service.utils import dump_job_config, dump_package_config
+from packit_service.worker.events import PullRequestGithubEvent
+from packit_service.worker.parser import Parser
+from packit_service.worker.result import TaskResults
+
+
+@pytest.fixture()
+def orjson_serializer():
+    pytest.importorskip("orjson")
+    register_orjson_serializer()
+    return CELERY_ORJSON_SERIALIZER
+
+
+def round_trip(obj, serializer):
+    content_type, content_encoding, data = serialization.dumps(obj, serializer)
+    return serialization.loads(data, content_type, content_encoding)
+
+
+@pytest.fixture()
+def task_payloads(github_pr_webhook):
+    package_config = PackageConfig.get_from_dict(
+        {
+            "specfile_path": "package.spec",
+            "jobs": [
+                {
+                    "job": "copr_build",
+                    "trigger": "pull_request",
+                    "targets": ["fedora-all"],
+                }
+            ],
+        }
+    )
+    job_config = package_config.jobs[0]
+    flexmock(PullRequestGithubEvent).should_receive("get_package_config").and_return(
+        package_config
+    )
+    event = Parser.parse_pr_event(github_pr_webhook)
+    kwargs = {
+        "package_config": dump_package_config(package_config),
+        "job_config": dump_job_config(job_config),
+        "event": event.get_dict(),
+    }
+    return [
+        # the main task gets the webhook as it is
+        ((github_pr_webhook,), {}, {}),
+        ((), kwargs, {}),
+        TaskResults.create_from(
+            success=True, msg="Job finished.", event=event, job_config=job_config
+        ),
+    ]
+
+
+def test_orjson_round_trip(orjson_serializer, task_payloads):
+    for payload in task_payloads:
+        expected = round_trip(payload, "json")
+        assert round_trip(payload, orjson_serializer) == expected
+
+        # the messages are processed the same during the switch of the serializer
+        _, _, data = serialization.dumps(payload, "json")
+        assert serialization.loads(data, "application/x-orjson", "utf-8") == expected
+
+
+def test_orjson_kombu_types(orjson_serializer):
+    payload = {
+        "created_at": datetime(2022, 7, 1, 12, 30),
+        "day": date(2022, 7, 1),
+        "size": Decimal("1.5"),
+        "logs": [b"some output", b"\xff\xfe"],
+        "id": 42,
+    }
+    assert round_trip(payload, orjson_serializer) == round_trip(payload, "json")
+    assert round_trip(payload, orjson_serializer) == payload
+
+    # the documents are interchangeable
+    _, _, data = serialization.dumps(payload, "json")
+    assert serialization.loads(data, "application/x-orjson", "utf-8") == payload
+    _, _, data = serialization.dumps(payload, orjson_serializer)
+    assert serialization.loads(data, "application/json", "utf-8") == payload
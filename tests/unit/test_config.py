@@ -194,6 +194,18 @@ def test_get_package_config_from_repo(
     )
 
 
+def test_get_repository_cache():
+    service_config = ServiceConfig()
+    service_config.repository_cache = None
+    assert service_config.get_repository_cache() is None
+
+    service_config.repository_cache = "/tmp/repository-cache"
+    service_config.add_repositories_to_repository_cache = False
+    repository_cache = service_config.get_repository_cache()
+    assert str(repository_cache.cache_path) == "/tmp/repository-cache"
+    assert not repository_cache.add_new
+
+
 def test_get_package_config_from_repo_no_project():
     """When neither a project nor a base_project is provided,
     None is returned and no exception is raised.
@@ -7,9 +7,11 @@ from flexmock import flexmock
 from fasjson_client import Client
 
 from packit.api import PackitAPI
+from packit_service.worker.handlers import distgit
 from packit_service.worker.handlers.distgit import (
     ProposeDownstreamHandler,
     DownstreamKojiBuildHandler,
+    remove_dir_in_background,
 )
 from packit_service.worker.events.event import EventData
 
@@ -78,6 +80,7 @@ PAGURE_PULL_REQUEST_COMMENT_PROCESSED = '{"created_at": 1658228337, "project_url
     ],
 )
 def test_retrigger_downstream_koji_build_pre_check(user_groups, data, check_passed):
+    flexmock(distgit, _USER_GROUPS_CACHE={})
     data_dict = json.loads(data)
     handler = DownstreamKojiBuildHandler(None, None, data_dict)
     flexmock(PackitAPI).should_receive("init_kerberos_ticket").and_return(None)
@@ -87,3 +90,43 @@ def test_retrigger_downstream_koji_build_pre_check(user_groups, data, check_pass
 
     result = handler.pre_check()
     assert result == check_passed
+
+
+def test_is_packager_cached():
+    flexmock(distgit, _USER_GROUPS_CACHE={})
+    handler = DownstreamKojiBuildHandler(None, None, {})
+    flexmock(PackitAPI).should_receive("init_kerberos_ticket").and_return(None).once()
+    flexmock(Client).should_receive("__getattr__").with_args(
+        "list_user_groups"
+    ).and_return(lambda username: flexmock(result=[{"groupname": "packager"}])).once()
+
+    assert handler.is_packager("me")
+    # served from the cache, FASJSON is not queried again
+    assert handler.is_packager("me")
+
+
+def test_cache_user_groups_bounded(monkeypatch):
+    flexmock(distgit, _USER_GROUPS_CACHE={}, FAS_USER_GROUPS_CACHE_MAXSIZE=2)
+    times = iter((0, 800, 1000, 1000))
+    monkeypatch.setattr(distgit, "monotonic", lambda: next(times))
+
+    distgit._cache_user_groups("expired", frozenset({"packager"}))
+    distgit._cache_user_groups("oldest", frozenset())
+    # the expired entry is dropped first
+    distgit._cache_user_groups("new", frozenset({"packager"}))
+    assert list(distgit._USER_GROUPS_CACHE) == ["oldest", "new"]
+
+    # the cache is still full, the oldest entry is evicted
+    distgit._cache_user_groups("newest", frozenset())
+    assert list(distgit._USER_GROUPS_CACHE) == ["new", "newest"]
+
+
+def test_remove_dir_in_background(tmp_path):
+    (tmp_path / "dist-git" / "tests").mkdir(parents=True)
+    (tmp_path / "dist-git" / "package.spec").touch()
+
+    remove_dir_in_background(str(tmp_path / "dist-git")).join()
+    assert not (tmp_path / "dist-git").exists()
+
+    # failures are only logged
+    remove_dir_in_background(str(tmp_path / "dist-git")).join()
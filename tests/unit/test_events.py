@@ -1538,3 +1538,15 @@ class TestEvents:
         assert datetime.utcnow() - latest_tf_models[0].submitted_time < timedelta(
             seconds=2
         )
+
+    def test_get_dict_cached(self, github_push_webhook):
+        event_object = Parser.parse_github_push_event(github_push_webhook)
+
+        event_dict = event_object.get_dict_cached()
+        assert event_dict == event_object.get_dict()
+        assert event_object.get_dict_cached() is event_dict
+
+        # the cache needs to be invalidated when the event changes
+        event_object.git_ref = "other-branch"
+        assert event_object.get_dict_cached() is not event_dict
+        assert event_object.get_dict_cached()["git_ref"] == "other-branch"
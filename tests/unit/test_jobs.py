@@ -41,6 +41,7 @@ from packit_service.worker.handlers import (
     KojiTaskReportHandler,
     ProposeDownstreamHandler,
 )
+from packit_service.worker.handlers.abstract import get_handlers_for_event_and_job_type
 from packit_service.worker.handlers.bodhi import CreateBodhiUpdateHandler
 from packit_service.worker.handlers.distgit import DownstreamKojiBuildHandler
 from packit_service.worker.handlers.koji import KojiBuildReportHandler
@@ -2223,58 +2224,67 @@ def test_get_handlers_triggered_by_check_rerun(event_kls, check_name_job, result
 
 
 @pytest.mark.parametrize(
-    "event_kls,handler,allowed_handlers",
+    "event_kls,job_type,handler,allowed_handlers",
     [
         pytest.param(
             PullRequestCommentGithubEvent,
+            JobType.copr_build,
             CoprBuildHandler,
             {CoprBuildHandler, KojiBuildHandler},
         ),
         pytest.param(
             CheckRerunPullRequestEvent,
+            JobType.production_build,
             KojiBuildHandler,
             {CoprBuildHandler, KojiBuildHandler},
         ),
         pytest.param(
             ReleaseEvent,
+            JobType.propose_downstream,
             ProposeDownstreamHandler,
             {KojiBuildHandler, ProposeDownstreamHandler},
         ),
     ],
 )
-def test_handler_matches_to_job(event_kls, handler: Type[JobHandler], allowed_handlers):
+def test_handler_matches_to_job(
+    event_kls, job_type, handler: Type[JobHandler], allowed_handlers
+):
     class Event(event_kls):  # type: ignore
         def __init__(self):
             pass
 
-    event = Event()
-    assert SteveJobs(event).is_handler_matching_the_event(handler, allowed_handlers)
+    assert handler in (
+        get_handlers_for_event_and_job_type(Event, job_type) & allowed_handlers
+    )
 
 
 @pytest.mark.parametrize(
-    "event_kls,handler,allowed_handlers",
+    "event_kls,job_type,handler,allowed_handlers",
     [
         pytest.param(
             PushPagureEvent,
+            JobType.copr_build,
             CoprBuildHandler,
             {DownstreamKojiBuildHandler},
         ),
         pytest.param(
             CheckRerunPullRequestEvent,
+            JobType.production_build,
             KojiBuildHandler,
             {CoprBuildHandler},
         ),
     ],
 )
 def test_handler_doesnt_match_to_job(
-    event_kls, handler: Type[JobHandler], allowed_handlers
+    event_kls, job_type, handler: Type[JobHandler], allowed_handlers
 ):
     class Event(event_kls):  # type: ignore
         def __init__(self):
             pass
 
-    event = Event()
-    assert not SteveJobs(event).is_handler_matching_the_event(handler, allowed_handlers)
+    assert handler not in (
+        get_handlers_for_event_and_job_type(Event, job_type) & allowed_handlers
+    )
 
 
 @pytest.mark.parametrize(
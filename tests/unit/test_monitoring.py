@@ -0,0 +1,31 @@
+# Copyright Contributors to the Packit project.
+# SPDX-License-Identifier: MIT
+from flexmock import flexmock
+
+from packit_service.worker import monitoring
+from packit_service.worker.monitoring import Pushgateway
+
+
+def test_push_resets_metrics(monkeypatch):
+    monkeypatch.setenv("HOSTNAME", "packit-worker-0")
+    pushgateway = Pushgateway()
+    flexmock(monitoring).should_receive("push_to_gateway").with_args(
+        pushgateway.pushgateway_address,
+        job="packit-worker-0",
+        registry=pushgateway.registry,
+    ).once()
+
+    pushgateway.copr_builds_queued.inc()
+    pushgateway.copr_build_finished_time.observe(4000)
+    pushgateway.copr_build_not_submitted_time.labels(reason="timeout").observe(60)
+    pushgateway.push()
+
+    registry = pushgateway.registry
+    assert registry.get_sample_value("copr_builds_queued_total") == 0
+    assert registry.get_sample_value("copr_build_finished_time_count") == 0
+    assert (
+        registry.get_sample_value(
+            "copr_build_not_submitted_time_count", {"reason": "timeout"}
+        )
+        is None
+    )
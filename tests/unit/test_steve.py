@@ -120,9 +120,15 @@ def test_process_message(event, private, enabled_private_namespaces, success):
     ).and_return(propose_downstream_model, run_model).times(1 if success else 0)
 
     model = flexmock(status="queued", id=1234, branch="main")
-    flexmock(ProposeDownstreamTargetModel).should_receive("create").with_args(
-        status=ProposeDownstreamTargetStatus.queued, branch="main"
-    ).and_return(model).times(1 if success else 0)
+    flexmock(ProposeDownstreamTargetModel).should_receive(
+        "create_for_branches"
+    ).with_args(
+        status=ProposeDownstreamTargetStatus.queued, branches={"main"}
+    ).and_return(
+        [model]
+    ).times(
+        1 if success else 0
+    )
     flexmock(model).should_receive("set_downstream_pr_url").with_args(
         downstream_pr_url="some_url"
     ).times(1 if success else 0)
@@ -4,11 +4,13 @@
 import prometheus_client
 import pytest
 from celery.app.task import Task
+from celery.canvas import Signature
 from copr.v3 import CoprRequestException
 from flexmock import flexmock
 
 from packit_service.worker.tasks import run_copr_build_handler
 from packit_service.worker.handlers import CoprBuildHandler
+from packit_service.worker.handlers.abstract import CeleryTask, _get_retry_queue
 
 
 def test_autoretry():
@@ -21,3 +23,35 @@ def test_autoretry():
     flexmock(Task).should_receive("retry").and_raise(CoprRequestException).once()
     with pytest.raises(CoprRequestException):
         run_copr_build_handler({}, {}, {})
+
+
+@pytest.mark.parametrize(
+    "enabled,queue",
+    [
+        pytest.param("true", "retries", id="enabled"),
+        pytest.param("", "long-running", id="disabled"),
+    ],
+)
+def test_retry_queue(monkeypatch, enabled, queue):
+    monkeypatch.setenv("CELERY_RETRY_QUEUE", enabled)
+    _get_retry_queue.cache_clear()
+
+    sent = []
+    monkeypatch.setattr(
+        Signature, "apply_async", lambda sig, *args, **kwargs: sent.append(sig)
+    )
+    run_copr_build_handler.push_request(
+        retries=0,
+        kwargs={},
+        called_directly=False,
+        delivery_info={"exchange": "", "routing_key": "long-running"},
+    )
+    try:
+        CeleryTask(run_copr_build_handler).retry(ex=CoprRequestException())
+    finally:
+        run_copr_build_handler.pop_request()
+        _get_retry_queue.cache_clear()
+
+    assert len(sent) == 1
+    assert sent[0].options["queue"] == queue
+    assert sent[0].options["retries"] == 1
@@ -1,7 +1,12 @@
 # Copyright Contributors to the Packit project.
 # SPDX-License-Identifier: MIT
 
-from packit_service.utils import only_once
+import gc
+
+from flexmock import flexmock
+
+from packit_service import utils
+from packit_service.utils import dump_package_config_cached, only_once
 
 
 def test_only_once():
@@ -74,3 +79,37 @@ def test_only_once_with_args_and_kwargs():
     assert counter == 1
     f("b", "b", three="different")
     assert counter == 1
+
+
+def test_dump_package_config_cached(monkeypatch):
+    class Config:
+        # unhashable as the packit configs
+        __hash__ = None
+
+    calls = 0
+
+    def dump_package_config(package_config):
+        # don't keep a reference to the config so that it can be collected
+        nonlocal calls
+        calls += 1
+        return {"specfile_path": "package.spec"}
+
+    monkeypatch.setattr(utils, "dump_package_config", dump_package_config)
+    # the entries of the configs from the other tests can be dropped meanwhile
+    monkeypatch.setattr(utils, "_DUMPED_PACKAGE_CONFIGS", utils.WeakIdentityCache())
+    config = Config()
+
+    dumped = dump_package_config_cached(config)
+    assert dumped == {"specfile_path": "package.spec"}
+    assert dump_package_config_cached(config) is dumped
+    assert calls == 1
+    assert config in utils._DUMPED_PACKAGE_CONFIGS
+
+    del config
+    gc.collect()
+    assert len(utils._DUMPED_PACKAGE_CONFIGS) == 0
+
+
+def test_dump_package_config_cached_none():
+    flexmock(utils).should_receive("dump_package_config").never()
+    assert dump_package_config_cached(None) is None
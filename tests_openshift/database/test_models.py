@@ -122,6 +122,24 @@ def test_get_merged_chroots(clean_before_and_after, too_many_copr_builds):
     assert builds_list[2].target[0][0] == "fedora-42-x86_64"
 
 
+def test_copr_build_get_all_by_status_submitted_before(
+    clean_before_and_after, a_copr_build_for_pr
+):
+    submitted_time = a_copr_build_for_pr.build_submitted_time
+    assert not list(
+        CoprBuildTargetModel.get_all_by_status(
+            SampleValues.status_pending, submitted_before=submitted_time
+        )
+    )
+    builds = list(
+        CoprBuildTargetModel.get_all_by_status(
+            SampleValues.status_pending,
+            submitted_before=submitted_time + timedelta(minutes=1),
+        )
+    )
+    assert [build.id for build in builds] == [a_copr_build_for_pr.id]
+
+
 def test_get_copr_build(clean_before_and_after, a_copr_build_for_pr):
     assert a_copr_build_for_pr.id
 
@@ -154,6 +172,13 @@ def test_copr_build_set_status(clean_before_and_after, a_copr_build_for_pr):
     assert b.status == "awesome"
 
 
+def test_copr_build_bulk_set_status(clean_before_and_after, multiple_copr_builds):
+    ids = [build.id for build in multiple_copr_builds[:2]]
+    CoprBuildTargetModel.bulk_set_status(ids, "error")
+    for build in multiple_copr_builds:
+        assert (build.status == "error") == (build.id in ids)
+
+
 def test_copr_build_set_build_logs_url(clean_before_and_after, a_copr_build_for_pr):
     url = "https://copr.fp.o/logs/12456/build.log"
     a_copr_build_for_pr.set_build_logs_url(url)
@@ -489,6 +514,15 @@ def test_tmt_test_multiple_runs(clean_before_and_after, multiple_new_test_runs):
     assert len({m.get_trigger_object() for m in multiple_new_test_runs}) == 2
 
 
+def test_tmt_test_get_all_by_status_eager(clean_before_and_after, a_new_test_run_pr):
+    runs = list(
+        TFTTestRunTargetModel.get_all_by_status(TestingFarmResult.new, eager=True)
+    )
+    assert len(runs) == 1
+    assert runs[0].id == a_new_test_run_pr.id
+    assert runs[0].get_job_trigger_model()
+
+
 def test_tmt_test_run_set_status(clean_before_and_after, a_new_test_run_pr):
     assert a_new_test_run_pr.status == TestingFarmResult.new
     a_new_test_run_pr.set_status(TestingFarmResult.running)
@@ -499,6 +533,23 @@ def test_tmt_test_run_set_status(clean_before_and_after, a_new_test_run_pr):
     assert b.status == TestingFarmResult.running
 
 
+def test_tmt_test_run_expire_stale(clean_before_and_after, a_new_test_run_pr):
+    submitted_time = a_new_test_run_pr.submitted_time
+    assert (
+        TFTTestRunTargetModel.expire_stale(submitted_time, TestingFarmResult.new) == 0
+    )
+    assert a_new_test_run_pr.status == TestingFarmResult.new
+
+    assert (
+        TFTTestRunTargetModel.expire_stale(
+            submitted_time + timedelta(minutes=1), TestingFarmResult.new
+        )
+        == 1
+    )
+    b = TFTTestRunTargetModel.get_by_pipeline_id(a_new_test_run_pr.pipeline_id)
+    assert b.status == TestingFarmResult.error
+
+
 def test_tmt_test_run_get_project(clean_before_and_after, a_new_test_run_pr):
     assert a_new_test_run_pr.status == TestingFarmResult.new
     assert a_new_test_run_pr.get_project().namespace == "the-namespace"
@@ -868,6 +919,18 @@ def test_propose_model_get_by_id(clean_before_and_after, propose_model):
     assert model.id == propose_model.id
 
 
+def test_propose_model_create_for_branches(clean_before_and_after):
+    models = ProposeDownstreamTargetModel.create_for_branches(
+        status=ProposeDownstreamTargetStatus.queued, branches=["f35", "f36"]
+    )
+    assert [model.branch for model in models] == ["f35", "f36"]
+    for model in models:
+        assert model.id
+        assert ProposeDownstreamTargetModel.get_by_id(id_=model.id).status == (
+            ProposeDownstreamTargetStatus.queued
+        )
+
+
 def test_create_propose_downstream_model(
     clean_before_and_after, propose_downstream_model_release
 ):